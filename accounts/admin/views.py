@@ -26,7 +26,7 @@ from accounts.models import User
 from django.contrib import messages
 from django.core.urlresolvers import reverse
 from django.shortcuts import get_object_or_404
-from ydns.utils.pagination import Pagination
+from ydns.utils.pagination import KeysetPagination
 from ydns.views import TemplateView
 
 
@@ -64,10 +64,11 @@ class HomeView(_BaseView):
     def get_context_data(self, **kwargs):
         context = super(HomeView, self).get_context_data(**kwargs)
         objects = User.objects.all()
-        context['pagination'] = Pagination(objects,
-                                           50,
-                                           reverse('accounts:admin:home'),
-                                           self.request.GET.get('p'))
+        context['pagination'] = KeysetPagination(objects,
+                                                 50,
+                                                 reverse('accounts:admin:home'),
+                                                 self.request.GET.get('p'),
+                                                 keys=('date_joined', 'id'))
         return context
 
 
@@ -76,8 +77,8 @@ class LockView(_UserView):
         context = self.get_context_data(**kwargs)
         user = context.pop('current_user')
 
-        if user.active:
-            user.active = False
+        if user.is_active:
+            user.is_active = False
             user.save()
             user.add_to_log('Account locked')
             messages.info(request, 'User account %s has been locked.' % user)
@@ -92,8 +93,8 @@ class UnlockView(_UserView):
         context = self.get_context_data(**kwargs)
         user = context.pop('current_user')
 
-        if not user.active:
-            user.active = True
+        if not user.is_active:
+            user.is_active = True
             user.save()
             user.add_to_log('Account unlocked')
             messages.info(request, 'User account {!s} has been unlocked.'.format(user))
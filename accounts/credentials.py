@@ -0,0 +1,123 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.conf import settings
+from ydns.utils.cache import ExpiringCache
+from .models import User
+
+import hashlib
+import hmac
+
+__all__ = ['CredentialCache', 'credential_cache']
+
+
+class CredentialCache(ExpiringCache):
+    """
+    Cache for successfully verified API credentials.
+
+    Entries map a digest of (identity, password) to the user ID and a
+    fingerprint of the account state at verification time. A cached entry
+    is only honoured if the fingerprint still matches the current account,
+    so password changes, API password resets and locks made by other worker
+    processes are picked up as well.
+    """
+
+    @staticmethod
+    def _digest(*parts):
+        msg = '\0'.join(parts).encode('utf-8')
+        return hmac.new(settings.SECRET_KEY.encode('utf-8'), msg, hashlib.sha256).hexdigest()
+
+    @classmethod
+    def make_key(cls, identity, password):
+        """
+        Build cache key for a pair of credentials.
+
+        :param identity: Email address or alias (str)
+        :param password: Password (str)
+        :return: str
+        """
+        if '@' in identity:
+            identity = identity.lower()
+        return cls._digest(identity, password)
+
+    @classmethod
+    def get_state(cls, user):
+        """
+        Get a fingerprint of the credential-relevant account state.
+
+        :param user: User
+        :return: str
+        """
+        return cls._digest(user.password or '', user.api_password_digest or '', str(user.is_active))
+
+    def add(self, identity, password, user):
+        """
+        Remember verified credentials.
+
+        :param identity: Email address or alias (str)
+        :param password: Password (str)
+        :param user: User
+        """
+        self.set(self.make_key(identity, password), (user.id, self.get_state(user)))
+
+    def get_user(self, identity, password):
+        """
+        Get the user for previously verified credentials.
+
+        :param identity: Email address or alias (str)
+        :param password: Password (str)
+        :return: User or None in case the credentials are not cached
+        """
+        key = self.make_key(identity, password)
+        entry = self.get(key)
+
+        if entry is None:
+            return None
+
+        user_id, state = entry
+
+        try:
+            user = User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            self.delete(key)
+            return None
+
+        if not hmac.compare_digest(state, self.get_state(user)):
+            self.delete(key)
+            return None
+
+        return user
+
+    def invalidate_user(self, user):
+        """
+        Remove all entries of a user.
+
+        :param user: User
+        :return: Number of removed entries (int)
+        """
+        return self.delete_matching(lambda v: v[0] == user.id)
+
+
+credential_cache = CredentialCache(max_size=settings.API_AUTH_CACHE_SIZE,
+                                   ttl=settings.API_AUTH_CACHE_TTL)
\ No newline at end of file
@@ -0,0 +1,77 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from accounts.models import User
+from django.core.management.base import BaseCommand
+from optparse import make_option
+
+import time
+
+
+class Command(BaseCommand):
+    """
+    This management command measures the cost of verifying API
+    credentials with the account password hasher compared to the
+    API password digest. No database access is required.
+    """
+    help = 'Benchmark API authentication'
+    option_list = BaseCommand.option_list + (
+        make_option('-n',
+                    action='store',
+                    type='int',
+                    dest='iterations',
+                    default=100,
+                    help='Number of iterations per method'),
+    )
+
+    @staticmethod
+    def measure(func, iterations):
+        """
+        Measure the average run time of a function.
+
+        :param func: Function (callable)
+        :param iterations: Number of calls (int)
+        :return: Average time in microseconds (float)
+        """
+        start = time.perf_counter()
+
+        for _ in range(iterations):
+            func()
+
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        password = User.objects.make_random_password(40)
+
+        user = User(email='benchmark@example.com')
+        user.set_password(password)
+        user.set_api_password(password)
+
+        before = self.measure(lambda: user.check_password(password), iterations)
+        after = self.measure(lambda: user.check_api_password(password), iterations)
+
+        self.stdout.write('check_password:     {:12.1f} us/request'.format(before))
+        self.stdout.write('check_api_password: {:12.1f} us/request'.format(after))
+        self.stdout.write('Speedup:            {:12.1f}x'.format(before / after if after else 0))
\ No newline at end of file
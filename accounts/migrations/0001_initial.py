@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import ydns.fields
+import django.utils.timezone
+from django.conf import settings
+import accounts.enum
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('password', models.CharField(verbose_name='password', max_length=128)),
+                ('last_login', models.DateTimeField(verbose_name='last login', blank=True, null=True)),
+                ('alias', models.CharField(max_length=16)),
+                ('email', models.EmailField(max_length=255, unique=True)),
+                ('is_active', models.BooleanField(default=False)),
+                ('is_admin', models.BooleanField(default=False)),
+                ('type', ydns.fields.EnumField(default=accounts.enum.UserType('Native'), enum=accounts.enum.UserType)),
+                ('api_password', models.CharField(max_length=40)),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now)),
+                ('timezone', models.CharField(max_length=100, null=True)),
+            ],
+            options={
+                'db_table': 'users',
+                'ordering': ('date_joined',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ActivationRequest',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('token', models.TextField()),
+                ('user', models.ForeignKey(to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'activation_requests',
+            },
+        ),
+        migrations.CreateModel(
+            name='PasswordRequest',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('token', models.TextField()),
+                ('user', models.ForeignKey(to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'password_requests',
+            },
+        ),
+    ]
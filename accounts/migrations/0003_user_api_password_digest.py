@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_journal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='api_password_digest',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='api_password_prefix',
+            field=models.CharField(max_length=8, null=True, db_index=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='user',
+            index_together=set([('date_joined', 'id')]),
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='journal',
+        ),
+    ]
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+import hashlib
+
+
+def store_api_password_digests(apps, schema_editor):
+    """
+    Store prefix and digest of API passwords which have only been stored in plaintext.
+    """
+    User = apps.get_model('accounts', 'User')
+
+    for user in User.objects.filter(api_password_digest__isnull=True).exclude(api_password='').iterator():
+        user.api_password_prefix = user.api_password[:8]
+        user.api_password_digest = hashlib.sha256(user.api_password.encode('utf-8')).hexdigest()
+        user.save(update_fields=('api_password_prefix', 'api_password_digest'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_api_password_digest'),
+    ]
+
+    operations = [
+        migrations.RunPython(store_api_password_digests, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='user',
+            name='api_password',
+        ),
+    ]
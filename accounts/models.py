@@ -27,8 +27,26 @@ from django.db import models
 from django.utils import timezone
 from django.utils.safestring import mark_safe
 from ydns.fields import EnumField
+from ydns.models import Message
+from ydns.utils.journal import journal_writer
 from .enum import UserType
 
+import hashlib
+import hmac
+
+# Number of leading API password characters stored for indexed lookups
+API_PASSWORD_PREFIX_LENGTH = 8
+
+
+def make_api_password_digest(raw_password):
+    """
+    Create the digest stored for an API password.
+
+    :param raw_password: API password (str)
+    :return: str
+    """
+    return hashlib.sha256(raw_password.encode('utf-8')).hexdigest()
+
 
 class _UserTokenModel(models.Model):
     """
@@ -71,17 +89,31 @@ class UserManager(BaseUserManager):
         :param kwargs: Keyword arguments
         :return: User instance
         """
-        api_password = self.make_random_password(40)
-
         # Create account
         user = self.model(email=self.normalize_email(email),
                           alias=self.get_alias(),
-                          api_password=api_password,
                           **kwargs)
+        user.set_api_password(self.make_random_password(40))
         user.set_password(password)
         user.save(using=self._db)
         return user
 
+    def get_by_api_password(self, raw_password):
+        """
+        Get a user by API password only.
+
+        :param raw_password: API password (str)
+        :return: User or None
+        """
+        if len(raw_password) <= API_PASSWORD_PREFIX_LENGTH:
+            return None
+
+        for user in self.filter(api_password_prefix=raw_password[:API_PASSWORD_PREFIX_LENGTH]):
+            if user.check_api_password(raw_password):
+                return user
+
+        return None
+
     def get_alias(self):
         """
         Get a random alias which is not in use.
@@ -104,16 +136,19 @@ class User(AbstractBaseUser):
     class Meta:
         db_table = 'users'
         ordering = ('date_joined',)
+        index_together = (
+            ('date_joined', 'id'),
+        )
 
     alias = models.CharField(max_length=16)
     email = models.EmailField(max_length=255, unique=True)
     is_active = models.BooleanField(default=False)
     is_admin = models.BooleanField(default=False)
     type = EnumField(UserType, default=UserType.NATIVE)
-    api_password = models.CharField(max_length=40)
+    api_password_prefix = models.CharField(max_length=API_PASSWORD_PREFIX_LENGTH, null=True, db_index=True)
+    api_password_digest = models.CharField(max_length=64, null=True)
     date_joined = models.DateTimeField(default=timezone.now)
     timezone = models.CharField(max_length=100, null=True)
-    journal = models.ManyToManyField('ydns.Message', related_name='user_journal')
 
     objects = UserManager()
 
@@ -123,10 +158,29 @@ class User(AbstractBaseUser):
         """
         Add a message to the journal.
 
+        The message is written by the journal writer, so it may show up
+        in the journal with a short delay.
+
         :param message: Message
         :return: Message
         """
-        return self.journal.create(message=message, user=self)
+        return journal_writer.add(Message(user=self, message=message))
+
+    def check_api_password(self, raw_password):
+        """
+        Check the API password in constant time.
+
+        API passwords are long random strings, so a single SHA-256 digest is
+        sufficient and keeps API authentication away from the (intentionally
+        slow) login password hasher.
+
+        :param raw_password: API password (str)
+        :return: bool
+        """
+        if not self.api_password_digest:
+            return False
+
+        return hmac.compare_digest(self.api_password_digest, make_api_password_digest(raw_password))
 
     def get_full_name(self):
         return self.email
@@ -134,6 +188,22 @@ class User(AbstractBaseUser):
     def get_short_name(self):
         return self.email
 
+    @property
+    def journal(self):
+        return Message.objects.filter(user=self)
+
+    def set_api_password(self, raw_password):
+        """
+        Set a new API password.
+
+        Only the digest and the prefix are stored, so the password cannot be
+        displayed later on.
+
+        :param raw_password: API password (str)
+        """
+        self.api_password_prefix = raw_password[:API_PASSWORD_PREFIX_LENGTH]
+        self.api_password_digest = make_api_password_digest(raw_password)
+
     @property
     def status_label(self):
         if self.is_active:
@@ -142,4 +212,4 @@ class User(AbstractBaseUser):
             s = '<span class="label label-info label-subtle">New</span>'
         else:
             s = '<span class="label label-default label-subtle">Inactive</span>'
-        return mark_safe(s)
+        return mark_safe(s)
\ No newline at end of file
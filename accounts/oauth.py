@@ -25,15 +25,84 @@
 from django.conf import settings
 from requests_oauthlib import OAuth2Session
 from requests_oauthlib.compliance_fixes import facebook_compliance_fix
+from threading import Lock
+from ydns.utils.http import make_adapter, make_session
+
+import os
 
 __all__ = ['google', 'facebook', 'github']
 
-# Google
-google = OAuth2Session(settings.GAPI_CLIENT_ID, scope=['email'])
+_lock = Lock()
+_adapter = None
+_adapter_pid = None
+
+
+def get_adapter():
+    """
+    Get the keep-alive HTTP adapter shared by all OAuth2 clients of the process.
+
+    The connection pool of the adapter is thread-safe, so concurrent logins
+    reuse connections to the providers instead of opening new ones.
+
+    :return: TimeoutHTTPAdapter
+    """
+    global _adapter, _adapter_pid
+
+    with _lock:
+        if _adapter_pid != os.getpid():
+            _adapter = make_adapter(settings.OAUTH_TIMEOUT,
+                                    retries=settings.OAUTH_RETRIES,
+                                    pool_size=settings.HTTP_POOL_SIZE)
+            _adapter_pid = os.getpid()
+
+        return _adapter
+
+
+def create_session(client_id, redirect_uri, scope=None):
+    """
+    Create an OAuth2 client for a single request.
+
+    Clients must not be shared between requests, as they hold per-request
+    state (redirect URI, scope and token). Do not close the client, as that
+    would close the shared adapter as well.
+
+    :param client_id: OAuth2 client ID (str)
+    :param redirect_uri: Redirect URI (str)
+    :param scope: Scope (str, list)
+    :return: OAuth2Session
+    """
+    return make_session(get_adapter(), OAuth2Session,
+                        client_id=client_id, redirect_uri=redirect_uri, scope=scope)
+
+
+def google(redirect_uri, scope=None):
+    """
+    Create a Google OAuth2 client.
+
+    :param redirect_uri: Redirect URI (str)
+    :param scope: Scope (str, list)
+    :return: OAuth2Session
+    """
+    return create_session(settings.GAPI_CLIENT_ID, redirect_uri, scope)
+
+
+def facebook(redirect_uri, scope=None):
+    """
+    Create a Facebook OAuth2 client.
+
+    :param redirect_uri: Redirect URI (str)
+    :param scope: Scope (str, list)
+    :return: OAuth2Session
+    """
+    return facebook_compliance_fix(create_session(settings.FACEBOOK_APP_ID, redirect_uri, scope))
+
 
-# Facebook
-facebook = OAuth2Session(settings.FACEBOOK_APP_ID, scope=['email'])
-facebook = facebook_compliance_fix(facebook)
+def github(redirect_uri, scope=None):
+    """
+    Create a GitHub OAuth2 client.
 
-# GitHub
-github = OAuth2Session(settings.GITHUB_CLIENT_ID)
\ No newline at end of file
+    :param redirect_uri: Redirect URI (str)
+    :param scope: Scope (str, list)
+    :return: OAuth2Session
+    """
+    return create_session(settings.GITHUB_CLIENT_ID, redirect_uri, scope)
\ No newline at end of file
@@ -28,7 +28,10 @@ from accounts.utils import activate_timezone, deactivate_timezone
 from collections import OrderedDict
 from django.conf import settings
 from django.contrib import messages
+from django.core.urlresolvers import reverse
 from django.http import HttpResponseNotFound
+from ydns.utils.db import delete_in_chunks
+from ydns.utils.pagination import KeysetPagination
 from ydns.views import FormView, TemplateView
 from . import forms
 
@@ -49,6 +52,12 @@ class ApiAccessView(_BaseView):
     """
     template_name = 'accounts/settings/api_access.html'
 
+    def get_context_data(self, **kwargs):
+        context = super(ApiAccessView, self).get_context_data(**kwargs)
+        # A new API password is displayed once right after it has been reset
+        context['api_password'] = self.request.session.pop('api_password', None)
+        return context
+
 
 class ChangePasswordView(_BaseView, FormView):
     """
@@ -85,7 +94,7 @@ class ClearJournalView(_BaseView):
     Clear the user journal.
     """
     def get(self, request, *args, **kwargs):
-        request.user.journal.all().delete()
+        delete_in_chunks(request.user.journal)
         request.user.add_to_log('Journal cleared')
 
         messages.info(request, 'The journal has been cleared.')
@@ -117,16 +126,28 @@ class JournalView(_BaseView):
     """
     template_name = 'accounts/settings/journal.html'
 
+    def get_context_data(self, **kwargs):
+        context = super(JournalView, self).get_context_data(**kwargs)
+        context['pagination'] = KeysetPagination(self.request.user.journal,
+                                                 50,
+                                                 reverse('accounts:settings:journal'),
+                                                 self.request.GET.get('p'),
+                                                 keys=('-date_created', '-id'))
+        return context
+
 
 class ResetApiPasswordView(_BaseView):
     """
     Reset API password.
     """
     def get(self, request, *args, **kwargs):
-        request.user.api_password = User.objects.make_random_password(40)
+        api_password = User.objects.make_random_password(40)
+        request.user.set_api_password(api_password)
         request.user.save()
         request.user.add_to_log('API Password reset')
 
+        request.session['api_password'] = api_password
+
         messages.info(request, 'Your API password has been reset. Please make sure to adjust your updater '
                                'configuration to use the new API password.')
 
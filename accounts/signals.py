@@ -22,10 +22,28 @@
 # SOFTWARE.
 ##
 
-from django.db.models.signals import pre_delete
+from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
+from .credentials import credential_cache
 from .models import User
 
+@receiver(post_save, sender=User)
+def _handle_user_change(sender, instance, created, **kwargs):
+    """
+    User instance change signal handler.
+
+    Drops cached API credentials, since the password, API password
+    or account status may have been changed.
+
+    :param sender: Model
+    :param instance: Instance
+    :param created: Whether the instance has been created (bool)
+    :param kwargs: Keyword arguments
+    """
+    if not created:
+        credential_cache.invalidate_user(instance)
+
+
 @receiver(pre_delete, sender=User)
 def _handle_user_deletion(sender, instance, **kwargs):
     """
@@ -35,4 +53,5 @@ def _handle_user_deletion(sender, instance, **kwargs):
     :param instance: Instance
     :param kwargs: Keyword arguments
     """
+    credential_cache.invalidate_user(instance)
     instance.journal.all().delete()
\ No newline at end of file
@@ -31,6 +31,7 @@ from django.contrib.auth import authenticate, login, logout
 from django.core.urlresolvers import reverse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from requests.exceptions import RequestException
 from ydns.utils.http import absolute_url
 from ydns.utils.mail import EmailMessage
 from ydns.views import FormView, TemplateView, View
@@ -146,17 +147,20 @@ class FacebookSignInView(View):
         if state != request.session.get('fb_state'):
             return self.response_error(request, 'Invalid state.')
 
-        facebook.redirect_uri = absolute_url(request, 'accounts:facebook_sign_in')
-        facebook.scope = ''  # need to reset scope to '', because otherwise we'll get trouble
+        # use an empty scope, because otherwise we'll get trouble
+        client = facebook(absolute_url(request, 'accounts:facebook_sign_in'), scope='')
 
         try:
-            facebook.fetch_token(self.URL_GET_TOKEN,
-                                 code=code,
-                                 client_secret=settings.FACEBOOK_APP_SECRET)
+            client.fetch_token(self.URL_GET_TOKEN,
+                               code=code,
+                               client_secret=settings.FACEBOOK_APP_SECRET)
         except Exception:
             return self.response_error(request, 'An error occurred while verifying response.')
 
-        response = facebook.get(self.URL_PROFILE)
+        try:
+            response = client.get(self.URL_PROFILE)
+        except RequestException:
+            return self.response_error(request, 'An error occurred while fetching the profile.')
 
         try:
             data = json.loads(response.content.decode('utf-8'))
@@ -198,10 +202,9 @@ class FacebookSignInView(View):
         :param kwargs: dict
         :return: HttpResponse
         """
-        facebook.redirect_uri = absolute_url(request, 'accounts:facebook_sign_in')
-        facebook.scope = 'email'
+        client = facebook(absolute_url(request, 'accounts:facebook_sign_in'), scope='email')
 
-        authorization_url, state = facebook.authorization_url('https://www.facebook.com/dialog/oauth')
+        authorization_url, state = client.authorization_url('https://www.facebook.com/dialog/oauth')
 
         request.session['fb_state'] = state
 
@@ -280,17 +283,20 @@ class GithubSignInView(View):
         if state != request.session.get('github_state'):
             return self.response_error(request, 'Invalid state.')
 
-        github.redirect_uri = absolute_url(request, 'accounts:github_sign_in')
-        github.scope = ''  # need to reset scope to '', because otherwise we'll get trouble
+        # use an empty scope, because otherwise we'll get trouble
+        client = github(absolute_url(request, 'accounts:github_sign_in'), scope='')
 
         try:
-            github.fetch_token(self.URL_GET_TOKEN,
+            client.fetch_token(self.URL_GET_TOKEN,
                                code=code,
                                client_secret=settings.GITHUB_CLIENT_SECRET)
         except Exception:
             return self.response_error(request, 'An error occurred while verifying response.')
 
-        response = github.get(self.URL_USER_PROFILE)
+        try:
+            response = client.get(self.URL_USER_PROFILE)
+        except RequestException:
+            return self.response_error(request, 'An error occurred while fetching the profile.')
 
         try:
             data = json.loads(response.content.decode('utf-8'))
@@ -330,10 +336,9 @@ class GithubSignInView(View):
         :param kwargs: dict
         :return: HttpResponse
         """
-        github.redirect_uri = absolute_url(request, 'accounts:github_sign_in')
-        github.scope = None
+        client = github(absolute_url(request, 'accounts:github_sign_in'))
 
-        authorization_url, state = github.authorization_url('https://github.com/login/oauth/authorize')
+        authorization_url, state = client.authorization_url('https://github.com/login/oauth/authorize')
 
         request.session['github_state'] = state
 
@@ -411,17 +416,20 @@ class GoogleSignInView(_AnonymousView):
         if state != request.session.get('gapi_state'):
             return self.response_error(request, 'Invalid state.')
 
-        google.redirect_uri = absolute_url(request, 'accounts:google_sign_in')
-        google.scope = ''  # need to reset scope to '', because otherwise we'll get trouble
+        # use an empty scope, because otherwise we'll get trouble
+        client = google(absolute_url(request, 'accounts:google_sign_in'), scope='')
 
         try:
-            google.fetch_token(self.URL_GET_TOKEN,
+            client.fetch_token(self.URL_GET_TOKEN,
                                code=code,
                                client_secret=settings.GAPI_CLIENT_SECRET)
         except Exception:
             return self.response_error(request, 'An error occurred while verifying response.')
 
-        response = google.get(self.URL_PLUS_API_PEOPLE_GET)
+        try:
+            response = client.get(self.URL_PLUS_API_PEOPLE_GET)
+        except RequestException:
+            return self.response_error(request, 'An error occurred while fetching the profile.')
 
         try:
             data = json.loads(response.content.decode('utf-8'))
@@ -466,10 +474,9 @@ class GoogleSignInView(_AnonymousView):
         :param kwargs: dict
         :return: HttpResponse
         """
-        google.redirect_uri = absolute_url(request, 'accounts:google_sign_in')
-        google.scope = 'email'
+        client = google(absolute_url(request, 'accounts:google_sign_in'), scope='email')
 
-        authorization_url, state = google.authorization_url(
+        authorization_url, state = client.authorization_url(
             'https://accounts.google.com/o/oauth2/auth',
             access_type='offline',
             approval_prompt='force')
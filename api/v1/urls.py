@@ -31,4 +31,5 @@ urlpatterns = (
     url(r'^ip$', views.CurrentIpAddressView.as_view(), name='ip'),
     url(r'^ip\.json$', views.CurrentIpAddressJsonView.as_view(), name='ip_json'),
     url(r'^update/$', views.UpdateView.as_view(), name='update'),
+    url(r'^update/batch$', views.BatchUpdateView.as_view(), name='update_batch'),
 )
\ No newline at end of file
@@ -22,13 +22,23 @@
 # SOFTWARE.
 ##
 
+from accounts.credentials import credential_cache
 from accounts.models import User
 from base64 import b64decode
-from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotFound, JsonResponse
-from django.utils import timezone
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseNotAllowed, HttpResponseNotFound, \
+    JsonResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from domains.records.enum import RecordType
+from domains.records.models import Host
 from netaddr import IPAddress, AddrConversionError, AddrFormatError
+from ydns.utils.ip import INVALID, IPV4, IPV6, ip_family
 from ydns.views import TemplateView
 
+import json
+
 
 class _BaseView(TemplateView):
     require_admin = False
@@ -106,58 +116,42 @@ class UpdateView(_BaseView):
         if 'host' not in request.GET:
             return HttpResponseBadRequest('Missing host parameter')
 
-        host = None
-        content = None
-        record = None
-
-        if request.GET.get('content'):
-            content = request.GET['content']
-        elif request.GET.get('ip'):
-            content = request.GET['ip']
-        else:
-            content = request.META['REMOTE_ADDR']
+        content = self.get_content(request.GET)
 
         if len(content) > 65535:
             return HttpResponseBadRequest('ip exceeds max length')
 
-        # Try to find the host
+        # Try to find the host along with its records
         try:
-            host = Host.objects.get(user=user, name=request.GET['host'])
+            host = Host.get(user, request.GET['host'])
         except Host.DoesNotExist:
             return HttpResponseNotFound('host not found')
 
-        if request.GET.get('record_id'):
-            try:
-                record_id = int(request.GET['record_id'])
-            except (ValueError, TypeError, IndexError):
-                return HttpResponseBadRequest('Parameter record_id has invalid value')
-            else:
-                try:
-                    record = host.records.get(id=record_id)
-                except Record.DoesNotExist:
-                    return HttpResponseNotFound('record not found')
-                else:
-                    return self.update_record(host, record, content, check=True, user=user)
+        status, message = self.update_host(host, content, request.GET.get('record_id'), user=user)
+        return HttpResponse(message, status=status)
 
-        # Find appropriate record
-        try:
-            ip = IPAddress(content)
-        except (AddrFormatError, AddrConversionError):
-            return HttpResponseBadRequest('invalid ip address (%s)' % (content,))
-        else:
-            desired_rr_type = 'A' if ip.version == 4 else 'AAAA'
-            records = host.records.filter(type=desired_rr_type)
+    def get_content(self, params):
+        """
+        Get the desired record content from request parameters.
 
-            if records.count() > 0:
-                record = records.first()
-                return self.update_record(host, record, content, user=user)
-            else:
-                return self.create_record(host, desired_rr_type, content, user=user)
+        :param params: Parameters (dict-like)
+        :return: str
+        """
+        if params.get('content'):
+            return str(params['content'])
+        elif params.get('ip'):
+            return str(params['ip'])
+        else:
+            return self.request.META['REMOTE_ADDR']
 
     def get_user(self, request):
         """
         Check authentication of a user by using HTTP Authorization.
 
+        Two schemes are supported: "Basic" with email address/alias and either
+        the API password or the account password, and "Bearer" with the
+        API password only.
+
         :param request: HttpRequest
         :return: User or None in case no user can be found
         """
@@ -171,9 +165,11 @@ class UpdateView(_BaseView):
 
         if len(params) < 2:
             raise self.AuthorizationError('Erroneous Authorization header')
+        elif params[0].lower() == 'bearer':
+            return self.get_active_user(User.objects.get_by_api_password(params[1]))
         elif params[0].lower() != 'basic':
-            raise self.AuthorizationError('Erroneous Authorization header: No other auth type '
-                                          'than "Basic" is supported')
+            raise self.AuthorizationError('Erroneous Authorization header: No other auth types '
+                                          'than "Basic" and "Bearer" are supported')
 
         try:
             data = b64decode(params[1])
@@ -191,25 +187,81 @@ class UpdateView(_BaseView):
         assert(email is not None)
         assert(password is not None)
 
-        # Check user account
-        if '@' in email:
-            qs = {'email__iexact': email}
-        else:
-            qs = {'alias': email}
+        # Check user account; credentials verified recently don't need to be hashed again
+        user = credential_cache.get_user(email, password)
 
-        try:
-            user = User.objects.get(**qs)
-        except User.DoesNotExist:
+        if user is None:
+            if '@' in email:
+                qs = {'email__iexact': email}
+            else:
+                qs = {'alias': email}
+
+            try:
+                user = User.objects.get(**qs)
+            except User.DoesNotExist:
+                return None
+
+            # The API password is cheap to verify, so try it before the account password
+            if not user.check_api_password(password) and not user.check_password(password):
+                return None
+
+            credential_cache.add(email, password, user)
+
+        return self.get_active_user(user)
+
+    @staticmethod
+    def get_active_user(user):
+        """
+        Check whether an authenticated user may use the API.
+
+        :param user: User or None
+        :return: User or None
+        """
+        if user is None:
             return None
+        elif not user.is_active:
+            return None  # account is inactive
+        elif user.get_ban():
+            return None  # user is banned
         else:
-            if not user.check_password(password) and not user.api_password == password:
-                return None
-            elif not user.is_active:
-                return None  # account is inactive
-            elif user.get_ban():
-                return None  # user is banned
+            return user
+
+    def update_host(self, host, content, record_id=None, user=None):
+        """
+        Update a host by either updating the most suitable record or creating one.
+
+        :param host: Host
+        :param content: Content (str)
+        :param record_id: Optional record ID to update a specific record
+        :param user: User
+        :return: tuple of HTTP status code and message
+        """
+        if record_id:
+            try:
+                record_id = int(record_id)
+            except (ValueError, TypeError, IndexError):
+                return 400, 'Parameter record_id has invalid value'
             else:
-                return user
+                record = host.get_record(record_id=record_id)
+
+                if record is None:
+                    return 404, 'record not found'
+                else:
+                    return self.update_record(host, record, content, check=True, user=user)
+
+        # Find appropriate record
+        family = ip_family(content)
+
+        if family == INVALID:
+            return 400, 'invalid ip address (%s)' % (content,)
+        else:
+            desired_rr_type = RecordType.A if family == IPV4 else RecordType.AAAA
+            record = host.get_record(desired_rr_type)
+
+            if record is not None:
+                return self.update_record(host, record, content, user=user)
+            else:
+                return self.create_record(host, desired_rr_type, content, user=user)
 
     def create_record(self, host, rr_type, content, user=None):
         """
@@ -219,46 +271,121 @@ class UpdateView(_BaseView):
         :param rr_type: Resource record type
         :param content: Content
         :param user: User
-        :return: HttpResponse
+        :return: tuple of HTTP status code and message
         """
-        record = host.records.create(domain=host.domain,
-                                     name=host.name,
-                                     type=rr_type,
-                                     content=content)
+        record = host.create_record(rr_type, content)
 
-        host.add_message('record_created',
-                         ip=self.request.META['REMOTE_ADDR'],
-                         user=user,
-                         user_agent=self.request.META.get('HTTP_USER_AGENT'),
-                         rr_type=rr_type,
-                         auto=True)
+        host.add_message(record,
+                         {'content': (None, content)},
+                         user_agent=self.request.META.get('HTTP_USER_AGENT'))
 
-        return HttpResponse('ok')
+        return 200, 'ok'
 
     def update_record(self, host, record, content, check=False, user=None):
+        """
+        Update a record.
+
+        :param host: Host the record belongs to
+        :param record: Record
+        :param content: Content
+        :param check: Whether to check the content against the record type (bool)
+        :param user: User
+        :return: tuple of HTTP status code and message
+        """
         if check:
             if record.type in ('A', 'AAAA'):
-                try:
-                    ip = IPAddress(content)
-                except (AddrConversionError, AddrFormatError):
-                    return HttpResponseBadRequest('type mismatch: record type is %s, but content is not a '
-                                                  'valid IP address' % record.type)
-                else:
-                    if ip.version == 4 and record.type != 'A':
-                        return HttpResponseBadRequest('type mismatch: record type is %s, but content is not a '
-                                                      'valid IPv6 address' % record.type)
-                    elif ip.version == 6 and record.type != 'AAAA':
-                        return HttpResponseBadRequest('type mismatch: record type is %s, but content is not a '
-                                                      'valid IPv4 address' % record.type)
-
-        record.content = content
-        record.date_last_modified = timezone.now()
-        record.save()
-
-        host.add_message('record_updated',
-                         ip=self.request.META['REMOTE_ADDR'],
-                         user=user,
-                         user_agent=self.request.META.get('HTTP_USER_AGENT'),
-                         content=content)
-
-        return HttpResponse('ok')
\ No newline at end of file
+                family = ip_family(content)
+
+                if family == INVALID:
+                    return 400, 'type mismatch: record type is %s, but content is not a ' \
+                                'valid IP address' % record.type
+                elif family == IPV4 and record.type != 'A':
+                    return 400, 'type mismatch: record type is %s, but content is not a ' \
+                                'valid IPv6 address' % record.type
+                elif family == IPV6 and record.type != 'AAAA':
+                    return 400, 'type mismatch: record type is %s, but content is not a ' \
+                                'valid IPv4 address' % record.type
+
+        changes = host.update_content(record, content)
+
+        if changes is None:
+            return 200, 'nochg'  # content is unchanged, nothing has been written
+
+        host.add_message(record,
+                         changes,
+                         user_agent=self.request.META.get('HTTP_USER_AGENT'))
+
+        return 200, 'ok'
+
+
+class BatchUpdateView(UpdateView):
+    """
+    The resource for updating many hosts within a single request.
+
+    Accepts a POST request with a JSON body like:
+      {"updates": [{"host": "a.example.com", "ip": "127.0.0.1"},
+                   {"host": "b.example.com", "content": "::1", "record_id": 1234}]}
+
+    Each item accepts the same parameters as the update resource. All
+    hosts are resolved at once and all changes are applied within a single
+    transaction. The response contains one result per item, in order.
+    """
+    @method_decorator(csrf_exempt)
+    def dispatch(self, request, *args, **kwargs):
+        return super(BatchUpdateView, self).dispatch(request, *args, **kwargs)
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponseNotAllowed(['POST'])
+
+    def post(self, request, *args, **kwargs):
+        try:
+            user = self.get_user(request)
+        except self.AuthorizationError as exc:
+            return HttpResponseBadRequest(str(exc))
+        else:
+            if user is None:
+                return HttpResponse('badauth', status=401)
+
+        try:
+            data = json.loads(request.body.decode('utf-8'))
+        except (UnicodeError, ValueError):
+            return HttpResponseBadRequest('Invalid JSON body')
+
+        items = data.get('updates') if isinstance(data, dict) else data
+
+        if not isinstance(items, list) or not all(isinstance(x, dict) for x in items):
+            return HttpResponseBadRequest('Missing updates list')
+        elif len(items) > settings.API_BATCH_MAX_SIZE:
+            return HttpResponseBadRequest('Too many updates (max. {})'.format(settings.API_BATCH_MAX_SIZE))
+
+        hosts = Host.get_many(user, [str(x['host']) for x in items if x.get('host')])
+        results = []
+
+        with transaction.atomic():
+            for item in items:
+                results.append(self.update_item(hosts, item, user))
+
+        return JsonResponse({'results': results})
+
+    def update_item(self, hosts, item, user):
+        """
+        Apply a single update of a batch.
+
+        :param hosts: Resolved hosts by name (dict)
+        :param item: Update parameters (dict)
+        :param user: User
+        :return: dict
+        """
+        name = str(item['host']) if item.get('host') else None
+        content = self.get_content(item)
+
+        if name is None:
+            status, message = 400, 'Missing host parameter'
+        elif len(content) > 65535:
+            status, message = 400, 'ip exceeds max length'
+        elif name not in hosts:
+            status, message = 404, 'host not found'
+        else:
+            status, message = self.update_host(hosts[name], content, item.get('record_id'), user=user)
+
+        return {'host': name, 'status': status, 'result': message}
\ No newline at end of file
@@ -0,0 +1,191 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from domains.enum import DomainStatus, DomainValidationResult
+from domains.models import Domain
+from domains.utils import delegation_checker
+from itertools import cycle
+from optparse import make_option
+from threading import Lock
+from ydns.utils.ratelimit import RateLimiter
+
+import time
+
+
+class Command(BaseCommand):
+    """
+    This management command re-validates the delegation of domains and
+    updates their status.
+
+    Domains are processed in chunks, never checked domains first and then
+    in order of their last check. Lookups run concurrently on a bounded
+    number of threads and are distributed over the resolvers, each of
+    which is limited to a number of queries per second. Results are
+    written with one UPDATE per status and chunk.
+
+    Failed lookups (e.g. timeouts) only update the time of the last check,
+    so that an unreachable resolver doesn't flag domains as erroneous.
+    """
+    help = 'Re-validate the delegation of domains'
+    option_list = BaseCommand.option_list + (
+        make_option('--age',
+                    action='store',
+                    type='int',
+                    dest='age',
+                    default=settings.DOMAIN_CHECK_INTERVAL,
+                    help='Check domains whose last check is older than this number of seconds'),
+        make_option('--limit',
+                    action='store',
+                    type='int',
+                    dest='limit',
+                    default=0,
+                    help='Maximum number of domains to check (0 for no limit)'),
+        make_option('--chunk-size',
+                    action='store',
+                    type='int',
+                    dest='chunk_size',
+                    default=500,
+                    help='Number of domains checked and updated at once'),
+        make_option('--workers',
+                    action='store',
+                    type='int',
+                    dest='workers',
+                    default=settings.DOMAIN_CHECK_WORKERS,
+                    help='Number of concurrent lookups'),
+        make_option('--rate',
+                    action='store',
+                    type='float',
+                    dest='rate',
+                    default=settings.DOMAIN_CHECK_RATE,
+                    help='Maximum number of queries per second and resolver (0 for no limit)'),
+        make_option('--nameserver',
+                    action='append',
+                    dest='nameservers',
+                    default=None,
+                    help='Resolver address (may be given multiple times)'),
+        make_option('--port',
+                    action='store',
+                    type='int',
+                    dest='port',
+                    default=None,
+                    help='Resolver port'),
+    )
+
+    def get_chunk(self, threshold, chunk_size):
+        """
+        Get the next domains to be checked.
+
+        :param threshold: Timestamp of the oldest check which is still valid (int)
+        :param chunk_size: Maximum number of domains (int)
+        :return: list of tuples (id, name)
+        """
+        qs = Domain.objects.filter(last_check__isnull=True).order_by('id')
+        chunk = list(qs.values_list('id', 'name')[:chunk_size])
+
+        if len(chunk) < chunk_size:
+            qs = Domain.objects.filter(last_check__lt=threshold).order_by('last_check', 'id')
+            chunk += list(qs.values_list('id', 'name')[:chunk_size - len(chunk)])
+
+        return chunk
+
+    def get_lookup(self, options):
+        """
+        Create a rate limited lookup function which distributes queries
+        over the resolvers.
+
+        :param options: Command options (dict)
+        :return: callable
+        """
+        if options['port'] is not None:
+            delegation_checker.port = options['port']
+
+        nameservers = options['nameservers'] or delegation_checker.nameservers or \
+            delegation_checker.make_resolver().nameservers
+        resolvers = [(delegation_checker.make_resolver([ns]), RateLimiter(options['rate'])) for ns in nameservers]
+        iterator = cycle(resolvers)
+        lock = Lock()
+
+        def lookup(name):
+            with lock:
+                resolver, limiter = next(iterator)
+
+            limiter.acquire()
+            return delegation_checker.lookup(name, resolver)
+
+        return lookup
+
+    def handle(self, *args, **options):
+        started = int(time.time())
+        threshold = started - options['age']
+        limit = options['limit']
+        lookup = self.get_lookup(options)
+        counts = {DomainStatus.OK: 0, DomainStatus.ERROR: 0, None: 0}
+
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                chunk_size = options['chunk_size']
+
+                if limit:
+                    chunk_size = min(chunk_size, limit - sum(counts.values()))
+                    if chunk_size <= 0:
+                        break
+
+                chunk = self.get_chunk(threshold, chunk_size)
+
+                if not chunk:
+                    break
+
+                results = pool.map(lambda d: lookup(d[1]), chunk)
+                statuses = {DomainStatus.OK: [], DomainStatus.ERROR: [], None: []}
+
+                for (domain_id, name), (result, servers, message, ttl) in zip(chunk, results):
+                    if result == DomainValidationResult.OK:
+                        status = DomainStatus.OK
+                    elif ttl is None:  # lookup failed, keep the current status
+                        status = None
+                    else:
+                        status = DomainStatus.ERROR
+
+                    statuses[status].append(domain_id)
+
+                now = int(time.time())
+
+                for status, ids in statuses.items():
+                    if not ids:
+                        continue
+
+                    values = {'last_check': now}
+
+                    if status is not None:
+                        values['status'] = status
+
+                    Domain.objects.filter(id__in=ids).update(**values)
+                    counts[status] += len(ids)
+
+        self.stdout.write('{} domain{} checked ({} OK, {} with errors, {} failed lookups) in {:.1f}s.'.format(
+            sum(counts.values()), '' if sum(counts.values()) == 1 else 's', counts[DomainStatus.OK],
+            counts[DomainStatus.ERROR], counts[None], time.time() - started))
\ No newline at end of file
@@ -0,0 +1,60 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.core.management.base import BaseCommand, CommandError
+from domains.models import Domain
+from domains.zone import iter_zone
+from optparse import make_option
+
+
+class Command(BaseCommand):
+    """
+    This management command writes the zone file of a domain, e.g. for
+    backups or to seed secondary name servers.
+    """
+    args = '<domain>'
+    help = 'Export the zone file of a domain'
+    option_list = BaseCommand.option_list + (
+        make_option('-o', '--output',
+                    action='store',
+                    dest='output',
+                    default=None,
+                    help='Output file (defaults to standard output)'),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 1:
+            raise CommandError('Usage: exportzone <domain>')
+
+        try:
+            domain = Domain.objects.get(name=args[0].encode('idna').decode('ascii').lower())
+        except Domain.DoesNotExist:
+            raise CommandError('Domain "{}" does not exist.'.format(args[0]))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.writelines(iter_zone(domain))
+        else:
+            for text in iter_zone(domain):
+                self.stdout.write(text, ending='')
\ No newline at end of file
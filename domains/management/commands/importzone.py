@@ -0,0 +1,92 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from accounts.models import User
+from django.core.management.base import BaseCommand, CommandError
+from domains.models import Domain
+from domains.zone import ZoneImportError, import_records, parse_csv, parse_zone_file
+from optparse import make_option
+
+
+class Command(BaseCommand):
+    """
+    This management command imports records from a zone or CSV file
+    into a domain, e.g. to migrate a zone from another provider.
+    """
+    args = '<domain> <file>'
+    help = 'Import records into a domain'
+    option_list = BaseCommand.option_list + (
+        make_option('--format',
+                    action='store',
+                    type='choice',
+                    choices=('zone', 'csv'),
+                    dest='format',
+                    default='zone',
+                    help='File format (zone or csv)'),
+        make_option('--owner',
+                    action='store',
+                    dest='owner',
+                    default=None,
+                    help='Email address of the record owner (defaults to the domain owner)'),
+        make_option('--chunk-size',
+                    action='store',
+                    type='int',
+                    dest='chunk_size',
+                    default=1000,
+                    help='Number of records inserted at once'),
+    )
+
+    def handle(self, *args, **options):
+        if len(args) != 2:
+            raise CommandError('Usage: importzone <domain> <file>')
+
+        try:
+            domain = Domain.objects.select_related('owner').get(name=args[0].encode('idna').decode('ascii').lower())
+        except Domain.DoesNotExist:
+            raise CommandError('Domain "{}" does not exist.'.format(args[0]))
+
+        if options['owner']:
+            try:
+                owner = User.objects.get(email=options['owner'])
+            except User.DoesNotExist:
+                raise CommandError('User "{}" does not exist.'.format(options['owner']))
+        else:
+            owner = domain.owner
+
+        with open(args[1], encoding='utf-8') as f:
+            text = f.read()
+
+        if options['format'] == 'csv':
+            entries = parse_csv(text)
+        else:
+            entries = parse_zone_file(domain, text)
+
+        try:
+            count = import_records(domain, entries, owner, options['chunk_size'])
+        except ZoneImportError as exc:
+            for index, message in exc.errors:
+                self.stderr.write('Entry {}: {}'.format(index, message) if index else message)
+            raise CommandError('Nothing has been imported.')
+
+        self.stdout.write('{} record{} imported.'.format(count, '' if count == 1 else 's'))
\ No newline at end of file
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import ydns.fields
+import domains.enum
+import django.utils.timezone
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Domain',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('master', models.CharField(max_length=128, null=True)),
+                ('last_check', models.IntegerField(null=True)),
+                ('type', ydns.fields.EnumField(enum=domains.enum.DomainType)),
+                ('notified_serial', models.IntegerField(null=True)),
+                ('account', models.CharField(max_length=40, null=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('access_type', ydns.fields.EnumField(enum=domains.enum.DomainAccessType)),
+                ('active', models.BooleanField(default=True)),
+                ('public_owner', models.BooleanField(default=False)),
+                ('status', ydns.fields.EnumField(enum=domains.enum.DomainStatus)),
+                ('owner', models.ForeignKey(null=True, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'domains',
+                'ordering': ('name',),
+            },
+        ),
+    ]
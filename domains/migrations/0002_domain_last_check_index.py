@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domains', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='domain',
+            name='last_check',
+            field=models.IntegerField(null=True, db_index=True),
+        ),
+    ]
@@ -44,7 +44,7 @@ class Domain(models.Model):
 
     name = models.CharField(max_length=255, unique=True)
     master = models.CharField(max_length=128, null=True)
-    last_check = models.IntegerField(null=True)
+    last_check = models.IntegerField(null=True, db_index=True)
     type = EnumField(DomainType)
     notified_serial = models.IntegerField(null=True)
     account = models.CharField(max_length=40, null=True)
@@ -60,8 +60,11 @@ class Domain(models.Model):
         return self.name.encode('ascii').decode('idna')
 
     def delete(self, using=None):
-        self.records.all().delete()
-        return super(Domain, self).delete(using)
+        from domains.utils import serial_scheduler
+
+        with serial_scheduler.suspend(self.id):
+            self.records.all().delete()
+            return super(Domain, self).delete(using)
 
     def get_permissions(self, user):
         s = set()
@@ -0,0 +1,122 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.conf import settings
+from ydns.utils.cache import ExpiringCache
+
+import copy
+import itertools
+
+__all__ = ['RecordCache', 'record_cache']
+
+
+class RecordCache(ExpiringCache):
+    """
+    Read-through cache of records by (name, type).
+
+    Entries hold the records of a name and either a single type or all
+    types (type None). They are dropped by the Record signal handlers and
+    by code changing records without signals (queryset updates and
+    bulk_create), see invalidate().
+
+    The cache is local to the process, so other processes may serve
+    entries which are up to one TTL old. It is disabled by default
+    (settings.RECORD_CACHE_SIZE = 0) and should only be enabled for a
+    single process or together with a short TTL.
+    """
+
+    def __init__(self, max_size=0, ttl=30):
+        super(RecordCache, self).__init__(max_size, ttl)
+        self._counter = itertools.count(1)
+        self._generation = 0
+
+    def get_records(self, names, load, rr_type=None):
+        """
+        Get the records of many names, loading missing names at once.
+
+        :param names: Record names (iterable)
+        :param load: Function returning the records of a list of names (callable)
+        :param rr_type: Resource record type or None for all types
+        :return: Copies of the records by name (dict); names without records are omitted.
+                 Records served from the cache have their `_cached` attribute set.
+        """
+        result = {}
+        missing = []
+
+        for name in names:
+            records = self.get((name, rr_type))
+
+            if records is None:
+                missing.append(name)
+            elif records:
+                result[name] = [self._copy(r) for r in records]
+
+        if missing:
+            generation = self._generation
+            loaded = {name: [] for name in missing}
+
+            for record in load(missing):
+                loaded[record.name].append(record)
+
+            for name, records in loaded.items():
+                if self._generation == generation:  # skip results which may have been invalidated meanwhile
+                    self.set((name, rr_type), tuple(copy.copy(r) for r in records))
+                if records:
+                    result[name] = records
+
+        return result
+
+    @staticmethod
+    def _copy(record):
+        record = copy.copy(record)
+        record._cached = True
+        return record
+
+    def invalidate(self, name, rr_type=None):
+        """
+        Drop the entries of a record name.
+
+        :param name: Record name (str)
+        :param rr_type: Resource record type; None drops the entries of all types
+        """
+        self._generation = next(self._counter)
+
+        if rr_type is None:
+            self.delete_matching_keys(lambda key: key[0] == name)
+        else:
+            self.delete((name, rr_type))
+            self.delete((name, None))
+
+    def invalidate_domain(self, domain_id):
+        """
+        Drop all entries holding records of a domain.
+
+        :param domain_id: Domain ID (int)
+        """
+        self._generation = next(self._counter)
+        self.delete_matching(lambda records: any(r.domain_id == domain_id for r in records))
+
+
+record_cache = RecordCache(max_size=settings.RECORD_CACHE_SIZE,
+                           ttl=settings.RECORD_CACHE_TTL)
\ No newline at end of file
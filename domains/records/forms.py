@@ -22,10 +22,9 @@
 # SOFTWARE.
 ##
 
-from django.core.exceptions import ValidationError
-from netaddr import AddrFormatError, IPAddress
 from ydns import forms
 from .enum import RecordType
+from .utils import validate_content, validate_number
 
 
 class CreateForm(forms.HorizontalForm):
@@ -46,43 +45,13 @@ class CreateForm(forms.HorizontalForm):
         return self.cleaned_data['name'].lower()
 
     def clean_content(self):
-        record_type = RecordType(self.cleaned_data['type'])
-
-        if record_type == RecordType.A:
-            try:
-                ip = IPAddress(self.cleaned_data['content'])
-            except AddrFormatError:
-                raise ValidationError('Not an IP address')
-            else:
-                if ip.version != 4:
-                    raise ValidationError('Not an IPv4 address')
-        elif record_type == RecordType.AAAA:
-            try:
-                ip = IPAddress(self.cleaned_data['content'])
-            except AddrFormatError:
-                raise ValidationError('Not an IP address')
-            else:
-                if ip.version != 6:
-                    raise ValidationError('Not an IPv6 address')
-
-        return self.cleaned_data['content']
+        return validate_content(RecordType(self.cleaned_data['type']), self.cleaned_data['content'])
 
     def clean_prio(self):
         record_type = RecordType(self.cleaned_data['type'])
 
         if record_type == RecordType.MX:
-            if not self.cleaned_data.get('prio'):
-                raise ValidationError('This field is required')
-            else:
-                try:
-                    n = int(self.cleaned_data['prio'])
-                except (ValueError, IndexError, TypeError):
-                    raise ValidationError('Must be an integer')
-                else:
-                    if n < 1 or n > 10000000:
-                        raise ValidationError('Must be between 1 and 10000000')
-                    else:
-                        return n
+            return validate_number(self.cleaned_data.get('prio'), required=True)
 
         return None
 
@@ -90,22 +59,19 @@ class CreateForm(forms.HorizontalForm):
         record_type = RecordType(self.cleaned_data['type'])
 
         if record_type == RecordType.MX:
-            if not self.cleaned_data.get('ttl'):
-                raise ValidationError('This field is required')
-            else:
-                try:
-                    n = int(self.cleaned_data['ttl'])
-                except (ValueError, IndexError, TypeError):
-                    raise ValidationError('Must be an integer')
-                else:
-                    if n < 1 or n > 10000000:
-                        raise ValidationError('Must be between 1 and 10000000')
-                    else:
-                        return n
+            return validate_number(self.cleaned_data.get('ttl'), required=True)
 
         return None
 
 
 class EditForm(CreateForm):
     label_css = 'col-lg-2 col-md-3'
-    field_css = 'col-lg-5 col-md-5'
\ No newline at end of file
+    field_css = 'col-lg-5 col-md-5'
+
+
+class ImportForm(forms.HorizontalForm):
+    file = forms.FileField(label='File')
+    format = forms.ChoiceField(label='Format', choices=(('zone', 'Zone file'),
+                                                        ('csv', 'CSV (name, type, content, TTL, priority)')))
+
+    field_css = 'col-lg-9 col-md-9'
\ No newline at end of file
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.db.models.deletion
+import ydns.fields
+import django.utils.timezone
+from django.conf import settings
+import domains.records.enum
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('domains', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Record',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('name', models.CharField(max_length=255, null=True)),
+                ('type', ydns.fields.EnumField(enum=domains.records.enum.RecordType)),
+                ('content', models.TextField(null=True)),
+                ('ttl', models.IntegerField(null=True)),
+                ('prio', models.IntegerField(null=True)),
+                ('change_date', models.IntegerField(null=True)),
+                ('disabled', models.BooleanField(default=False)),
+                ('ordername', models.CharField(max_length=255, null=True)),
+                ('auth', models.BooleanField(default=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('date_modified', models.DateTimeField(default=django.utils.timezone.now)),
+                ('domain', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='domains.Domain')),
+                ('owner', models.ForeignKey(null=True, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'records',
+                'ordering': ('name',),
+            },
+        ),
+        migrations.CreateModel(
+            name='Update',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('changes', ydns.fields.JsonField()),
+                ('user_agent', models.TextField(null=True)),
+                ('record', models.ForeignKey(to='records.Record')),
+            ],
+            options={
+                'db_table': 'record_updates',
+                'ordering': ('date_created',),
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='record',
+            index_together=set([('name', 'type'), ('domain', 'name', 'type'), ('domain', 'ordername')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='update',
+            index_together=set([('record', 'date_created')]),
+        ),
+    ]
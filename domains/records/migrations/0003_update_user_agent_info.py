@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import ydns.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('records', '0002_record_update_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='update',
+            name='user_agent_info',
+            field=ydns.fields.JsonField(null=True),
+        ),
+    ]
@@ -23,11 +23,16 @@
 ##
 
 from domains.enum import DomainAccessType
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.safestring import mark_safe
 from ydns.fields import EnumField, JsonField
 from ydns.utils import user_agent
+from ydns.utils.journal import journal_writer
+from .cache import record_cache
 from .enum import RecordType
 
 
@@ -38,6 +43,11 @@ class Record(models.Model):
     class Meta:
         db_table = 'records'
         ordering = ('name',)
+        index_together = (
+            ('domain', 'name', 'type'),
+            ('domain', 'ordername'),
+            ('name', 'type'),
+        )
 
     domain = models.ForeignKey('domains.Domain', on_delete=models.PROTECT)
     name = models.CharField(max_length=255, null=True)
@@ -116,6 +126,259 @@ class Record(models.Model):
         return Update.objects.filter(record=self)
 
 
+class Host(object):
+    """
+    A host as seen by dynamic DNS clients.
+
+    Hosts aren't stored on their own; a host consists of all records
+    sharing the same name which a user is allowed to modify.
+    """
+    class DoesNotExist(ObjectDoesNotExist):
+        pass
+
+    def __init__(self, name, domain, user, records):
+        self.name = name
+        self.domain = domain
+        self.user = user
+        self.records = list(records)
+
+    def __str__(self):
+        return self.name.encode('ascii').decode('idna')
+
+    @classmethod
+    def get(cls, user, name):
+        """
+        Resolve a host including all its records.
+
+        :param user: User
+        :param name: Host name (str)
+        :return: Host
+        :raises: Host.DoesNotExist
+        """
+        hosts = cls.get_many(user, (name,))
+
+        if name not in hosts:
+            raise cls.DoesNotExist(name)
+
+        return hosts[name]
+
+    @classmethod
+    def get_many(cls, user, names):
+        """
+        Resolve many hosts including all their records.
+
+        Records are looked up with a single query on (domain, name) by taking
+        every parent name of the hosts as domain candidates. If the record cache
+        is enabled, records are read through the cache and the permissions are
+        checked on the cached records; otherwise, the query only loads the
+        records the user is allowed to modify. Records that users cannot edit
+        (e.g. the SOA and NS records of the domain) are never part of a host.
+
+        :param user: User
+        :param names: Host names (iterable)
+        :return: Hosts by name as given (dict); unknown hosts are omitted
+        """
+        lookup = {}
+
+        for name in names:
+            try:
+                idna_name = name.encode('idna').decode('ascii').lower()
+            except UnicodeError:
+                continue  # not a valid host name
+
+            lookup.setdefault(idna_name, []).append(name)
+
+        if not lookup:
+            return {}
+
+        if record_cache.max_size > 0:
+            records = record_cache.get_records(lookup.keys(), cls.load_records)
+            records = {name: [r for r in host_records if cls.has_permission(user, r)]
+                       for name, host_records in records.items()}
+        else:
+            records = {}
+
+            for record in cls.load_records(lookup.keys()).filter(cls.get_permission_filter(user)):
+                records.setdefault(record.name, []).append(record)
+
+        hosts = {}
+
+        for idna_name, host_records in records.items():
+            host_records = [r for r in host_records if cls.is_updatable(r)]
+
+            if not host_records:
+                continue
+
+            host = cls(idna_name, host_records[0].domain, user, host_records)
+
+            for name in lookup[idna_name]:
+                hosts[name] = host
+
+        return hosts
+
+    @classmethod
+    def load_records(cls, names):
+        """
+        Load the records of many host names with a single query.
+
+        :param names: IDNA encoded host names (list)
+        :return: QuerySet
+        """
+        candidates = set()
+
+        for name in names:
+            candidates.update(cls.get_domain_candidates(name))
+
+        return Record.objects.select_related('domain')\
+                             .filter(domain__name__in=candidates, name__in=names)\
+                             .order_by('id')
+
+    @staticmethod
+    def get_domain_candidates(name):
+        """
+        Get all names a host may belong to, e.g. "a.example.com", "example.com" and "com"
+        for a host named "a.example.com".
+
+        :param name: Host name (str)
+        :return: list
+        """
+        labels = name.split('.')
+        return ['.'.join(labels[i:]) for i in range(len(labels))]
+
+    @staticmethod
+    def get_permission_filter(user):
+        """
+        Get the query filter for records a user is allowed to modify.
+
+        This matches the write permission of Record.get_permissions.
+
+        :param user: User
+        :return: Q
+        """
+        if user.is_admin:
+            return Q()
+
+        return (Q(domain__access_type=DomainAccessType.PRIVATE, domain__owner=user) |
+                Q(domain__access_type=DomainAccessType.PUBLIC, owner=user))
+
+    @staticmethod
+    def is_updatable(record):
+        """
+        Return whether a record may be changed through a host.
+
+        This matches the records offered for editing by the web interface.
+
+        :param record: Record (with domain)
+        :return: bool
+        """
+        return record.type.is_usable and record.is_editable
+
+    @staticmethod
+    def has_permission(user, record):
+        """
+        Return whether a user is allowed to modify a record.
+
+        This matches the write permission of Record.get_permissions.
+
+        :param user: User
+        :param record: Record (with domain)
+        :return: bool
+        """
+        if user.is_admin:
+            return True
+
+        domain = record.domain
+
+        if domain.access_type == DomainAccessType.PRIVATE:
+            return domain.owner_id == user.id
+        elif domain.access_type == DomainAccessType.PUBLIC:
+            return record.owner_id == user.id
+
+        return False
+
+    def add_message(self, record, changes, user_agent=None):
+        """
+        Add an update entry for a record of this host.
+
+        :param record: Record
+        :param changes: Changes, mapping field names to (old, new) tuples (dict)
+        :param user_agent: User agent (str or None)
+        :return: Update
+        """
+        return journal_writer.add(Update.make(record, changes, user_agent))
+
+    def create_record(self, rr_type, content):
+        """
+        Create a record for this host.
+
+        :param rr_type: Resource record type
+        :param content: Content (str)
+        :return: Record
+        """
+        record = Record.objects.create(domain=self.domain,
+                                       name=self.name,
+                                       type=rr_type,
+                                       content=content,
+                                       owner=self.user)
+        self.records.append(record)
+        return record
+
+    @staticmethod
+    def update_content(record, content):
+        """
+        Change the content of a record.
+
+        The row is only written if the stored content actually differs, by
+        issuing a single conditional UPDATE. This also makes concurrent
+        identical updates a no-op. Records served from the record cache may
+        be stale, so they are always checked by the conditional UPDATE (the
+        previous content in the changes is the cached one then).
+
+        :param record: Record
+        :param content: New content (str)
+        :return: Changes (dict) or None if nothing has changed
+        """
+        if record.content == content and not getattr(record, '_cached', False):
+            return None
+
+        now = timezone.now()
+        count = Record.objects.filter(id=record.id)\
+                              .exclude(content=content)\
+                              .update(content=content, date_modified=now)
+
+        if not count:
+            return None
+
+        # Queryset updates don't send signals, so the serial update needs to be scheduled here
+        from domains.utils import serial_scheduler
+        serial_scheduler.schedule(record.domain_id)
+
+        # ... and the same goes for the record cache
+        record_cache.invalidate(record.name, record.type)
+
+        changes = {'content': (record.content, content)}
+        record.content = content
+        record.date_modified = now
+        return changes
+
+    def get_record(self, rr_type=None, record_id=None):
+        """
+        Get the first record of a specific type and/or ID.
+
+        :param rr_type: Resource record type (optional)
+        :param record_id: Record ID (int, optional)
+        :return: Record or None
+        """
+        for record in self.records:
+            if rr_type is not None and record.type != rr_type:
+                continue
+            if record_id is not None and record.id != record_id:
+                continue
+            return record
+
+        return None
+
+
 class Update(models.Model):
     """
     Record updates.
@@ -123,11 +386,35 @@ class Update(models.Model):
     class Meta:
         db_table = 'record_updates'
         ordering = ('date_created',)
+        index_together = (
+            ('record', 'date_created'),
+        )
 
     date_created = models.DateTimeField(default=timezone.now)
     record = models.ForeignKey(Record)
     changes = JsonField()
     user_agent = models.TextField(null=True)
+    user_agent_info = JsonField(null=True)
+
+    @classmethod
+    def make(cls, record, changes, user_agent=None):
+        """
+        Create an (unsaved) update entry.
+
+        The user agent is parsed and stored along with the entry if
+        USER_AGENT_STORE_PARSED is set, so displaying it needs no parsing.
+
+        :param record: Record
+        :param changes: Changes (dict)
+        :param user_agent: User agent (str or None)
+        :return: Update
+        """
+        update = cls(record=record, changes=changes, user_agent=user_agent)
+
+        if user_agent and settings.USER_AGENT_STORE_PARSED:
+            update.user_agent_info = update.ua
+
+        return update
 
     @property
     def summary(self):
@@ -146,25 +433,14 @@ class Update(models.Model):
 
     @property
     def ua(self):
-        if self.user_agent:
-            data = user_agent.parse(self.user_agent)
-            s = None
-
-            if data['browser']:
-                s = data['browser']
-                if data['os']:
-                    s += ' ({})'.format(data['os'])
-
-                    if data['os'] == 'OS X':
-                        data['icon'] = 'apple'
-                    elif data['os'] == 'Windows':
-                        data['icon'] = 'windows'
-                    elif data['os'] == 'Linux':
-                        data['icon'] = 'linux'
-
-            if s:
-                data['s'] = s
-
-            return data
+        """
+        Parsed user agent (see ydns.utils.user_agent.parse).
+
+        :return: dict or None
+        """
+        if self.user_agent_info is not None:
+            return self.user_agent_info
+        elif self.user_agent:
+            return user_agent.parse(self.user_agent)
 
         return None
\ No newline at end of file
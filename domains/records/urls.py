@@ -28,6 +28,7 @@ from . import views
 urlpatterns = (
     url(r'^$', views.HomeView.as_view(), name='home'),
     url(r'^new$', views.CreateView.as_view(), name='create'),
+    url(r'^import$', views.ImportView.as_view(), name='import'),
     url(r'^(?P<record_id>\d+)/delete$', views.DeleteView.as_view(), name='delete'),
     url(r'^(?P<record_id>\d+)/edit$', views.EditView.as_view(), name='edit'),
     url(r'^(?P<record_id>\d+)$', views.DetailView.as_view(), name='detail'),
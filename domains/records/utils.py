@@ -0,0 +1,98 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.core.exceptions import ValidationError
+from ydns.utils.ip import INVALID, IPV4, IPV6, ip_family
+from .enum import RecordType
+
+
+def make_record_name(domain, name):
+    """
+    Make a fully qualified record name for a domain.
+
+    Names not ending with the domain name are considered relative and the
+    domain name is appended.
+
+    :param domain: Domain
+    :param name: Record name (str)
+    :return: IDNA encoded record name (str)
+    """
+    name = name.lower().rstrip('.')
+    s = '.{!s}'.format(domain)
+
+    if name in ('', '@'):
+        name = str(domain)
+    elif name != str(domain) and not name.endswith(s):
+        name += s
+
+    return name.encode('idna').decode('ascii')
+
+
+def validate_content(record_type, content, family=None):
+    """
+    Validate the content of a record.
+
+    :param record_type: Record type (RecordType)
+    :param content: Record content (str)
+    :param family: Address family of the content if known already, see ydns.utils.ip (int)
+    :return: Cleaned content (str)
+    :raises ValidationError: Invalid content
+    """
+    if record_type in (RecordType.A, RecordType.AAAA):
+        if family is None:
+            family = ip_family(content)
+
+        if family == INVALID:
+            raise ValidationError('Not an IP address')
+        elif record_type == RecordType.A and family != IPV4:
+            raise ValidationError('Not an IPv4 address')
+        elif record_type == RecordType.AAAA and family != IPV6:
+            raise ValidationError('Not an IPv6 address')
+
+    return content
+
+
+def validate_number(value, required=False):
+    """
+    Validate a priority or TTL value.
+
+    :param value: Value (int, str or None)
+    :param required: Whether a value is required (bool)
+    :return: int or None
+    :raises ValidationError: Invalid value
+    """
+    if not value:
+        if required:
+            raise ValidationError('This field is required')
+        return None
+
+    try:
+        n = int(value)
+    except (ValueError, IndexError, TypeError):
+        raise ValidationError('Must be an integer')
+    else:
+        if n < 1 or n > 10000000:
+            raise ValidationError('Must be between 1 and 10000000')
+        else:
+            return n
\ No newline at end of file
@@ -22,27 +22,31 @@
 # SOFTWARE.
 ##
 
-from domains.models import Domain
+from domains.views import DomainMixin
+from domains.zone import ZoneImportError, import_records, parse_csv, parse_zone_file
 from django.contrib import messages
 from django.core.urlresolvers import reverse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from ydns.utils.http import request_cached
+from ydns.utils.journal import journal_writer
 from ydns.utils.navbar import NavBarDivider, NavBarHeader, NavBarItem
-from ydns.utils.pagination import Pagination
+from ydns.utils.pagination import KeysetPagination
 from ydns.views import FormView, TemplateView
 from . import forms
 from .enum import RecordType
+from .models import Update
+from .utils import make_record_name
 
 
-class _DomainView(TemplateView):
+class _DomainView(DomainMixin, TemplateView):
     require_login = True
     require_admin = False
     require_domain_perms = ''
 
     def dispatch(self, request, *args, **kwargs):
         if self.require_domain_perms:
-            context = self.get_context_data(**kwargs)
-            s = context['domain_permissions']
+            s = self.domain_permissions
 
             for c in self.require_domain_perms:
                 if c not in s:
@@ -50,18 +54,6 @@ class _DomainView(TemplateView):
 
         return super(_DomainView, self).dispatch(request, *args, **kwargs)
 
-    @property
-    def domain(self):
-        if not hasattr(self, '_domain'):
-            self._domain = self.get_context_data(**self.kwargs)['domain']
-        return self._domain
-
-    def get_context_data(self, **kwargs):
-        context = super(_DomainView, self).get_context_data(**kwargs)
-        context['domain'] = get_object_or_404(Domain, name=self.kwargs['name'])
-        context['domain_permissions'] = context['domain'].get_permissions(self.request.user)
-        return context
-
     def get_navbar_context(self):
         """
         Contextual navbar context.
@@ -69,8 +61,7 @@ class _DomainView(TemplateView):
         :param request: HttpRequest
         :return:
         """
-        context = self.get_context_data(**self.kwargs)
-        perms = context['domain_permissions']
+        perms = self.domain_permissions
         entries = [
             NavBarItem('Overview', reverse('domains:detail', args=(self.domain.name,)))
         ]
@@ -90,8 +81,7 @@ class _RecordView(_DomainView):
 
     def dispatch(self, request, *args, **kwargs):
         if self.require_record_perms:
-            context = self.get_context_data(**kwargs)
-            s = context['record_permissions']
+            s = self.record_permissions
 
             for c in self.require_record_perms:
                 if c not in s:
@@ -101,8 +91,8 @@ class _RecordView(_DomainView):
 
     def get_context_data(self, **kwargs):
         context = super(_RecordView, self).get_context_data(**kwargs)
-        context['record'] = get_object_or_404(context['domain'].records, id=int(self.kwargs['record_id']))
-        context['record_permissions'] = context['record'].get_permissions(self.request.user)
+        context['record'] = self.record
+        context['record_permissions'] = self.record_permissions
         return context
 
     def get_navbar_context(self):
@@ -112,9 +102,8 @@ class _RecordView(_DomainView):
         :param request: HttpRequest
         :return:
         """
-        context = self.get_context_data(**self.kwargs)
-        d_perms = context['domain_permissions']
-        r_perms = context['record_permissions']
+        d_perms = self.domain_permissions
+        r_perms = self.record_permissions
         entries = [
             NavBarItem('Overview', reverse('domains:detail', args=(self.domain.name,)))
         ]
@@ -138,11 +127,25 @@ class _RecordView(_DomainView):
 
         return context
 
+    def get_record(self):
+        """
+        Get the record, sharing the domain instance of the request.
+
+        :return: Record
+        """
+        record = get_object_or_404(self.domain.records.select_related('owner'), id=int(self.kwargs['record_id']))
+        record.domain = self.domain
+        return record
+
     @property
     def record(self):
-        if not hasattr(self, '_record'):
-            self._record = self.get_context_data(**self.kwargs)['record']
-        return self._record
+        return request_cached(self.request, ('record', self.kwargs['name'], self.kwargs['record_id']),
+                              self.get_record)
+
+    @property
+    def record_permissions(self):
+        return request_cached(self.request, ('record_permissions', self.kwargs['name'], self.kwargs['record_id']),
+                              lambda: self.record.get_permissions(self.request.user))
 
 
 class CreateView(_DomainView, FormView):
@@ -155,15 +158,7 @@ class CreateView(_DomainView, FormView):
 
     def form_valid(self, form):
         domain = self.domain
-        name = form.cleaned_data['name']
-
-        # if name does not end with domain name, append it
-        s = '.{!s}'.format(domain)
-        if name != str(domain) and not name.endswith(s):
-            name += s
-
-        # IDNA
-        name = name.encode('idna').decode('ascii')
+        name = make_record_name(domain, form.cleaned_data['name'])
 
         # create record
         record = domain.records.create(domain=domain,
@@ -182,6 +177,42 @@ class CreateView(_DomainView, FormView):
         return kwargs
 
 
+class ImportView(_DomainView, FormView):
+    """
+    Import records from a zone or CSV file.
+    """
+    form_class = forms.ImportForm
+    require_domain_perms = 'rwa'
+    template_name = 'domains/records/import.html'
+
+    def form_valid(self, form):
+        domain = self.domain
+
+        try:
+            text = form.cleaned_data['file'].read().decode('utf-8')
+        except UnicodeDecodeError:
+            form.add_error('file', 'The file must be UTF-8 encoded')
+            return self.form_invalid(form)
+
+        if form.cleaned_data['format'] == 'csv':
+            entries = parse_csv(text)
+        else:
+            entries = parse_zone_file(domain, text)
+
+        try:
+            count = import_records(domain, entries, self.request.user)
+        except ZoneImportError as exc:
+            for index, message in exc.errors[:10]:
+                form.add_error('file', 'Entry {}: {}'.format(index, message) if index else message)
+            return self.form_invalid(form)
+
+        self.request.user.add_to_log('Imported {} record{} into domain {!s}'.format(count,
+                                                                                  '' if count == 1 else 's',
+                                                                                  domain))
+        messages.success(self.request, '{} record{} imported.'.format(count, '' if count == 1 else 's'))
+        return self.redirect('domains:records:home', args=(domain.name,))
+
+
 class DeleteView(_RecordView):
     require_record_perms = 'rw'
 
@@ -245,7 +276,7 @@ class EditView(_RecordView, FormView):
 
             # Add update record
             user_agent = self.request.META.get('HTTP_USER_AGENT') or None
-            record.updates.create(record=record, changes=changes, user_agent=user_agent)
+            journal_writer.add(Update.make(record, changes, user_agent))
 
             messages.success(self.request, 'Record "{!s}" updated.'.format(record))
         else:
@@ -280,8 +311,9 @@ class HomeView(_DomainView):
         context = super(HomeView, self).get_context_data(**kwargs)
         domain = context['domain']
         objects = domain.records.all()
-        context['pagination'] = Pagination(objects,
-                                           25,
-                                           reverse('domains:records:home', args=(domain.name,)),
-                                           self.request.GET.get('p'))
+        context['pagination'] = KeysetPagination(objects,
+                                                 25,
+                                                 reverse('domains:records:home', args=(domain.name,)),
+                                                 self.request.GET.get('p'),
+                                                 keys=('name', 'id'))
         return context
\ No newline at end of file
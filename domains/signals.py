@@ -22,10 +22,13 @@
 # SOFTWARE.
 ##
 
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from .models import Domain
-from .utils import create_basic_records
+from .records.cache import record_cache
+from .records.enum import RecordType
+from .records.models import Record
+from .utils import create_basic_records, invalidate_user_domains, serial_scheduler
 
 
 @receiver(post_save, sender=Domain)
@@ -39,4 +42,56 @@ def _handle_new_domain(sender, instance, created, **kwargs):
     :param kwargs: Keyword arguments
     """
     if created:
-        create_basic_records(instance)
\ No newline at end of file
+        create_basic_records(instance)
+    else:
+        record_cache.invalidate_domain(instance.id)
+
+    invalidate_user_domains(instance.owner_id)
+
+
+@receiver(post_delete, sender=Domain)
+def _handle_domain_deletion(sender, instance, **kwargs):
+    """
+    Signal handler for domain deletion.
+
+    :param sender: Model
+    :param instance: Instance
+    :param kwargs: Keyword arguments
+    """
+    record_cache.invalidate_domain(instance.id)
+    invalidate_user_domains(instance.owner_id)
+
+
+@receiver(post_init, sender=Record)
+def _handle_record_init(sender, instance, **kwargs):
+    """
+    Signal handler for record initialization; remembers the loaded name and
+    type, so that cache entries can be dropped after the record has been renamed.
+
+    :param sender: Model
+    :param instance: Instance
+    :param kwargs: Keyword arguments
+    """
+    instance._cache_key = (instance.name, instance.type)
+
+
+@receiver(post_delete, sender=Record)
+@receiver(post_save, sender=Record)
+def _handle_record_change(sender, instance, **kwargs):
+    """
+    Signal handler for record changes; schedules a serial update of the domain
+    and drops cached records and the cached domain list of the record owner.
+
+    :param sender: Model
+    :param instance: Instance
+    :param kwargs: Keyword arguments
+    """
+    if instance.type != RecordType.SOA:
+        serial_scheduler.schedule(instance.domain_id)
+
+    for name, rr_type in {getattr(instance, '_cache_key', (None, None)), (instance.name, instance.type)}:
+        if name is not None:
+            record_cache.invalidate(name, rr_type)
+
+    instance._cache_key = (instance.name, instance.type)
+    invalidate_user_domains(instance.owner_id)
\ No newline at end of file
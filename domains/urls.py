@@ -29,6 +29,7 @@ from . import views
 urlpatterns = (
     url(r'^new$', views.CreateView.as_view(), name='create'),
     url(r'^(?P<name>[a-zA-Z0-9-.]+)/delete$', views.DeleteView.as_view(), name='delete'),
+    url(r'^(?P<name>[a-zA-Z0-9-.]+)/export$', views.ExportView.as_view(), name='export'),
     url(r'^(?P<name>[a-zA-Z0-9-.]+)/records/', include('domains.records.urls', namespace='records')),
     url(r'^(?P<name>[a-zA-Z0-9-.]+)$', views.DetailView.as_view(), name='detail'),
 )
\ No newline at end of file
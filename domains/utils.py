@@ -22,13 +22,25 @@
 # SOFTWARE.
 ##
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
 from django.utils import timezone
 from .common import PRIMARY_NS, SECONDARY_NS
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from threading import Lock
+from ydns.utils.background import PeriodicFlusher
+from ydns.utils.cache import ExpiringCache
 from .enum import DomainValidationResult
+from .models import Domain
+from .records.cache import record_cache
 from .records.enum import RecordType
+from .records.models import Record
 
 import dns.resolver
+import os
 
 
 def create_basic_records(domain):
@@ -50,62 +62,291 @@ def create_basic_records(domain):
                               owner=domain.owner)
 
 
-def update_serial(domain):
+def get_user_domains(user):
+    """
+    Get domains a user owns or owns records in.
+
+    The result is cached per user (if USER_DOMAINS_CACHE_TTL is set) and
+    invalidated by record and domain changes (see invalidate_user_domains).
+
+    :param user: User
+    :return: list
+    """
+    key = 'user_domains:{}'.format(user.id)
+    domains = cache.get(key) if settings.USER_DOMAINS_CACHE_TTL else None
+
+    if domains is None:
+        record_domains = Record.objects.filter(owner=user).values('domain_id')
+        domains = list(Domain.objects.select_related('owner')
+                                     .filter(Q(owner=user) | Q(id__in=record_domains))
+                                     .distinct())
+
+        if settings.USER_DOMAINS_CACHE_TTL:
+            cache.set(key, domains, settings.USER_DOMAINS_CACHE_TTL)
+
+    return domains
+
+
+def invalidate_user_domains(*user_ids):
+    """
+    Drop cached domain lists of users.
+
+    :param user_ids: User IDs (int or None)
+    """
+    keys = ['user_domains:{}'.format(x) for x in set(user_ids) if x is not None]
+
+    if keys:
+        cache.delete_many(keys)
+
+
+def make_serial(current=0):
+    """
+    Get the next SOA serial in YYYYMMDDnn format.
+
+    Once the daily counter exceeds 99, the serial continues into the
+    range of the following day(s), so serials are always increasing.
+
+    :param current: Current serial (int)
+    :return: int
+    """
+    return max(int(timezone.now().strftime('%Y%m%d')) * 100, current + 1)
+
+
+def parse_serial(content):
+    """
+    Get the serial from SOA record content.
+
+    :param content: SOA record content (str)
+    :return: int
+    """
+    parts = (content or '').replace('(', ' ').split()
+
+    try:
+        return int(parts[2])
+    except (IndexError, ValueError):
+        return 0
+
+
+def update_serial(domain, create=True):
     """
     Update serial for a domain.
 
-    If no SOA record exists, such record is created and returned.
-    Otherwise, the serial is updated.
+    If no SOA record exists, such record is created and returned (unless
+    `create` is False). Otherwise, the serial is updated by an atomic
+    compare-and-set, which is retried if another process has changed the
+    record in the meantime.
 
     :param domain: Domain
-    :return: Record
+    :param create: Whether to create a missing SOA record (bool)
+    :return: Record or None if there is no SOA record
     """
-    s = timezone.now().strftime('%Y%m%d')
     content = '{name}. hostmaster.yns.io. ({serial} 3600 1800 604800 600)'
 
     try:
         soa_record = domain.records.get(type=RecordType.SOA)
     except ObjectDoesNotExist:
-        s += '00'
+        if not create:
+            return None
+
         soa_record = domain.records.create(domain=domain,
                                            name=domain.name,
                                            type=RecordType.SOA,
-                                           content=content.format(name=domain.name, serial=s),
+                                           content=content.format(name=domain.name, serial=make_serial()),
                                            owner=domain.owner)
         return soa_record
 
-    else:
-        inc = int(soa_record.content[8:])
+    while True:
+        new_content = content.format(name=domain.name, serial=make_serial(parse_serial(soa_record.content)))
+        now = timezone.now()
+        count = Record.objects.filter(id=soa_record.id, content=soa_record.content)\
+                              .update(content=new_content, date_modified=now)
 
-        if soa_record.content[:8] == s:
-            inc += 1
+        if count:
+            record_cache.invalidate(soa_record.name, RecordType.SOA)
+            soa_record.content = new_content
+            soa_record.date_modified = now
+            return soa_record
 
-        s += '{0:02}'.format(inc)
-        soa_record.content = content.format(name=domain.name, serial=s)
-        soa_record.date_modified = timezone.now()
-        soa_record.save()
-        return soa_record
+        try:
+            soa_record = Record.objects.get(id=soa_record.id)
+        except ObjectDoesNotExist:
+            return None  # deleted in the meantime
 
 
-def validate_domain_name(name):
+class SerialScheduler(PeriodicFlusher):
     """
-    Validate a domain name.
+    Coalesces serial updates of domains.
 
-    :param name: Domain name (str)
-    :return: server list (list)
-    :raises: DomainValidationError
+    Domains are marked as changed by schedule() and their serials are
+    updated at most once per interval, regardless of the number of
+    record changes in between. The scheduler only updates existing SOA
+    records, as a domain without one is being deleted.
     """
-    has_primary = False
-    has_secondary = False
-    servers = []
 
-    try:
-        answers = dns.resolver.query(name, 'NS')
-    except dns.resolver.NXDOMAIN:  # domain does not exist
-        return DomainValidationResult.NOT_FOUND, servers, None
-    except Exception as exc:  # any other exception has been raised
-        return DomainValidationResult.EXCEPTION_RAISED, servers, str(exc)
-    else:
+    def __init__(self, interval):
+        """
+        Initialize scheduler.
+
+        :param interval: Update interval in seconds; 0 updates serials immediately (int, float)
+        """
+        super(SerialScheduler, self).__init__(interval)
+        self._domain_ids = set()
+        self._suspended = set()
+
+    def flush(self):
+        """
+        Update the serials of all changed domains.
+
+        :return: Number of updated domains (int)
+        """
+        with self._lock:
+            domain_ids, self._domain_ids = self._domain_ids, set()
+
+        if not domain_ids:
+            return 0
+
+        count = 0
+
+        for domain in Domain.objects.filter(id__in=domain_ids):
+            if update_serial(domain, create=False):
+                count += 1
+
+        return count
+
+    def reset(self):
+        self._domain_ids = set()
+
+    def schedule(self, domain_id):
+        """
+        Mark a domain as changed.
+
+        :param domain_id: Domain ID (int)
+        """
+        with self._lock:
+            if domain_id in self._suspended:
+                return
+
+            self._domain_ids.add(domain_id)
+
+            if self.interval > 0:
+                self.start()
+                return
+
+        self.flush()
+
+    @contextmanager
+    def suspend(self, domain_id):
+        """
+        Context manager which drops pending and ignores new serial updates of a
+        domain, e.g. while it is being deleted.
+
+        :param domain_id: Domain ID (int)
+        """
+        with self._lock:
+            self._suspended.add(domain_id)
+            self._domain_ids.discard(domain_id)
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._suspended.discard(domain_id)
+
+
+class DelegationChecker(object):
+    """
+    Checks the delegation (NS records) of domains.
+
+    Lookups run on a bounded thread pool with strict resolver timeouts, so
+    that an unresponsive name server blocks the caller for no longer than
+    the resolver lifetime and cannot occupy more than a fixed number of
+    threads. Results are cached by domain name: answers for the TTL of
+    the NS record set (capped at max_ttl), negative answers for negative_ttl.
+    Lookup errors are not cached.
+    """
+
+    def __init__(self, nameservers=None, port=53, timeout=2.0, lifetime=3.0, workers=4, cache_size=1024,
+                 max_ttl=3600, negative_ttl=60):
+        """
+        Initialize delegation checker.
+
+        :param nameservers: Resolver addresses or None for the system resolvers (list)
+        :param port: Resolver port (int)
+        :param timeout: Seconds to wait for a single server (float)
+        :param lifetime: Seconds to wait for a lookup in total (float)
+        :param workers: Maximum number of concurrent lookups (int)
+        :param cache_size: Maximum number of cached results; 0 disables caching (int)
+        :param max_ttl: Maximum seconds to cache an answer (int)
+        :param negative_ttl: Seconds to cache a negative answer (int)
+        """
+        self.nameservers = nameservers
+        self.port = port
+        self.timeout = timeout
+        self.lifetime = lifetime
+        self.workers = workers
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.cache = ExpiringCache(max_size=cache_size, ttl=negative_ttl)
+        self._lock = Lock()
+        self._pid = None
+        self._pool = None
+        self._resolver = None
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pid != os.getpid():  # threads do not survive a fork
+                self._pid = os.getpid()
+                self._pool = ThreadPoolExecutor(max_workers=self.workers)
+            return self._pool
+
+    @property
+    def resolver(self):
+        if self._resolver is None:
+            self._resolver = self.make_resolver(self.nameservers)
+        return self._resolver
+
+    def make_resolver(self, nameservers=None):
+        """
+        Create a resolver using the configured port and timeouts.
+
+        :param nameservers: Resolver addresses or None for the system resolvers (list)
+        :return: dns.resolver.Resolver
+        """
+        resolver = dns.resolver.Resolver(configure=not nameservers)
+
+        if nameservers:
+            resolver.nameservers = list(nameservers)
+
+        resolver.port = self.port
+        resolver.timeout = self.timeout
+        resolver.lifetime = self.lifetime
+        return resolver
+
+    def lookup(self, name, resolver=None):
+        """
+        Look up the name servers of a domain.
+
+        The TTL is None if the lookup failed and its result must not be cached.
+
+        :param name: Domain name (str)
+        :param resolver: Resolver to use instead of the default one (dns.resolver.Resolver)
+        :return: tuple (result, server list, message, ttl)
+        """
+        servers = []
+
+        try:
+            answers = (resolver or self.resolver).query(name, 'NS')
+        except dns.resolver.NXDOMAIN:  # domain does not exist
+            return DomainValidationResult.NOT_FOUND, servers, None, self.negative_ttl
+        except dns.resolver.NoAnswer as exc:  # domain exists, but has no name servers
+            return DomainValidationResult.EXCEPTION_RAISED, servers, str(exc), self.negative_ttl
+        except Exception as exc:  # any other exception has been raised
+            return DomainValidationResult.EXCEPTION_RAISED, servers, str(exc), None
+
+        has_primary = False
+        has_secondary = False
+
         for rdata in answers:
             rt = rdata.to_text()
 
@@ -119,9 +360,63 @@ def validate_domain_name(name):
 
             servers.append(rt)
 
+        ttl = min(answers.rrset.ttl, self.max_ttl)
+
         if not has_primary:
-            return DomainValidationResult.MISSING_PRIMARY, servers, None
+            return DomainValidationResult.MISSING_PRIMARY, servers, None, ttl
         elif not has_secondary:
-            return DomainValidationResult.MISSING_SECONDARY, servers, None
+            return DomainValidationResult.MISSING_SECONDARY, servers, None, ttl
         else:
-            return DomainValidationResult.OK, servers, None
\ No newline at end of file
+            return DomainValidationResult.OK, servers, None, ttl
+
+    def validate(self, name, use_cache=True):
+        """
+        Validate the delegation of a domain.
+
+        :param name: Domain name (str)
+        :param use_cache: Use cached results (bool)
+        :return: tuple (result, server list, message)
+        """
+        key = name.lower().rstrip('.')
+
+        if use_cache:
+            cached = self.cache.get(key)
+
+            if cached is not None:
+                result, servers, message = cached
+                return result, list(servers), message
+
+        future = self.pool.submit(self.lookup, name)
+
+        try:
+            result, servers, message, ttl = future.result(timeout=self.lifetime + 1)
+        except FutureTimeoutError:
+            future.cancel()
+            return DomainValidationResult.EXCEPTION_RAISED, [], 'Name server lookup timed out'
+
+        if ttl:
+            self.cache.set(key, (result, tuple(servers), message), ttl=ttl)
+
+        return result, servers, message
+
+
+def validate_domain_name(name):
+    """
+    Validate a domain name.
+
+    :param name: Domain name (str)
+    :return: server list (list)
+    :raises: DomainValidationError
+    """
+    return delegation_checker.validate(name)
+
+
+delegation_checker = DelegationChecker(nameservers=settings.DNS_RESOLVER_NAMESERVERS,
+                                       port=settings.DNS_RESOLVER_PORT,
+                                       timeout=settings.DNS_RESOLVER_TIMEOUT,
+                                       lifetime=settings.DNS_RESOLVER_LIFETIME,
+                                       workers=settings.DNS_RESOLVER_WORKERS,
+                                       cache_size=settings.DNS_CACHE_SIZE,
+                                       max_ttl=settings.DNS_CACHE_MAX_TTL,
+                                       negative_ttl=settings.DNS_NEGATIVE_CACHE_TTL)
+serial_scheduler = SerialScheduler(settings.SOA_SERIAL_INTERVAL)
\ No newline at end of file
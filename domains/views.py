@@ -23,10 +23,13 @@
 ##
 
 from django.contrib import messages
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from ydns.utils.http import request_cached
 from ydns.views import FormView, TemplateView
 from .enum import DomainAccessType, DomainStatus, DomainType
 from .models import Domain
+from .zone import iter_zone
 from . import forms
 
 
@@ -35,31 +38,45 @@ class _BaseView(TemplateView):
     require_admin = False
 
 
-class _DomainView(_BaseView):
+class DomainMixin(object):
+    """
+    Mixin for views of a specific domain.
+
+    The domain and the permissions of the current user are resolved once
+    per request and shared by all view instances, the middleware and
+    templates of that request.
+    """
+
+    @property
+    def domain(self):
+        name = self.kwargs['name']
+        return request_cached(self.request, ('domain', name),
+                              lambda: get_object_or_404(Domain.objects.select_related('owner'), name=name))
+
+    @property
+    def domain_permissions(self):
+        return request_cached(self.request, ('domain_permissions', self.kwargs['name']),
+                              lambda: self.domain.get_permissions(self.request.user))
+
+    def get_context_data(self, **kwargs):
+        context = super(DomainMixin, self).get_context_data(**kwargs)
+        context['domain'] = self.domain
+        context['domain_permissions'] = self.domain_permissions
+        return context
+
+
+class _DomainView(DomainMixin, _BaseView):
     require_perms = ''
 
     def dispatch(self, request, *args, **kwargs):
         if self.require_perms:
-            context = self.get_context_data(**kwargs)
-            s = context['domain_permissions']
+            s = self.domain_permissions
 
             for c in self.require_perms:
                 if c not in s:
                     return self.redirect_insufficient_privileges(request)
         return super(_DomainView, self).dispatch(request, *args, **kwargs)
 
-    @property
-    def domain(self):
-        if not hasattr(self, '_domain'):
-            self._domain = self.get_context_data(**self.kwargs)['domain']
-        return self._domain
-
-    def get_context_data(self, **kwargs):
-        context = super(_DomainView, self).get_context_data(**kwargs)
-        context['domain'] = get_object_or_404(Domain, name=self.kwargs['name'])
-        context['domain_permissions'] = context['domain'].get_permissions(self.request.user)
-        return context
-
 
 class CreateView(_BaseView, FormView):
     form_class = forms.CreateForm
@@ -109,6 +126,19 @@ class DeleteView(_DomainView):
         return self.redirect('dashboard')
 
 
+class ExportView(_DomainView):
+    """
+    Download the zone file of a domain.
+    """
+    require_perms = 'a'
+
+    def get(self, request, *args, **kwargs):
+        domain = self.domain
+        response = StreamingHttpResponse(iter_zone(domain), content_type='text/dns; charset=utf-8')
+        response['Content-Disposition'] = 'attachment; filename="{}.zone"'.format(domain.name)
+        return response
+
+
 class DetailView(_DomainView):
     require_login = False
     require_perms = 'r'
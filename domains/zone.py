@@ -0,0 +1,307 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from ydns.utils.db import iter_chunks
+from ydns.utils.ip import ip_families
+from .records.cache import record_cache
+from .records.enum import RecordType
+from .records.models import Record
+from .records.utils import make_record_name, validate_content, validate_number
+from .utils import invalidate_user_domains, update_serial
+
+import csv
+import dns.exception
+import dns.name
+import dns.rdatatype
+import dns.zone
+
+__all__ = ['ZoneImportError', 'format_record', 'import_records', 'iter_zone', 'parse_csv', 'parse_zone_file']
+
+# record types whose content ends with a host name
+HOSTNAME_TYPES = (RecordType.CNAME, RecordType.MX, RecordType.NS, RecordType.PTR, RecordType.SRV)
+
+# record types whose content consists of character strings
+TEXT_TYPES = (RecordType.SPF, RecordType.TXT)
+
+
+class ZoneImportError(Exception):
+    """
+    Raised if records cannot be imported.
+
+    The errors attribute lists tuples of (entry number, message).
+    """
+
+    def __init__(self, errors):
+        message = '{} invalid entr{}'.format(len(errors), 'y' if len(errors) == 1 else 'ies')
+        super(ZoneImportError, self).__init__(message)
+        self.errors = errors
+
+
+def qualify(name):
+    """
+    Make a host name fully qualified.
+
+    :param name: Host name (str)
+    :return: str
+    """
+    return name if name.endswith('.') else name + '.'
+
+
+def quote(text):
+    """
+    Quote a character string unless it is quoted already.
+
+    :param text: str
+    :return: str
+    """
+    if text.startswith('"'):
+        return text
+    return '"{}"'.format(text.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def is_in_domain(domain, name):
+    """
+    Check whether a fully qualified name is the domain or one of its subdomains.
+
+    :param domain: Domain
+    :param name: Host name (str)
+    :return: bool
+    """
+    name = name.lower().rstrip('.')
+    return name == str(domain) or name.endswith('.{!s}'.format(domain))
+
+
+def format_content(record):
+    """
+    Format the RDATA of a record in zone file syntax.
+
+    PowerDNS stores host names without the trailing dot and the priority
+    of MX and SRV records in a separate column.
+
+    :param record: Record
+    :return: str
+    """
+    content = record.content or ''
+
+    if record.type == RecordType.SOA:
+        fields = content.replace('(', ' ').replace(')', ' ').split()
+        fields[:2] = [qualify(f) for f in fields[:2]]
+        content = ' '.join(fields)
+    elif record.type in HOSTNAME_TYPES and content:
+        fields = content.split()
+        fields[-1] = qualify(fields[-1])
+        content = ' '.join(fields)
+    elif record.type in TEXT_TYPES:
+        content = quote(content)
+
+    if record.type in (RecordType.MX, RecordType.SRV):
+        content = '{} {}'.format(record.prio or 0, content)
+
+    return content
+
+
+def format_record(record):
+    """
+    Format a record as zone file line (without line terminator).
+
+    Disabled records are commented out.
+
+    :param record: Record
+    :return: str
+    """
+    line = '{}\t{}IN\t{}\t{}'.format(qualify(record.name),
+                                     '{}\t'.format(record.ttl) if record.ttl else '',
+                                     record.type,
+                                     format_content(record))
+
+    if record.disabled:
+        line = '; ' + line
+
+    return line
+
+
+def iter_zone(domain, chunk_size=1000):
+    """
+    Generate the zone file of a domain (RFC 1035 master file format).
+
+    Records are fetched in primary key chunks, so memory usage does not
+    depend on the size of the zone. The SOA record is written first, as
+    required for a zone file.
+
+    :param domain: Domain
+    :param chunk_size: Number of records fetched at once (int)
+    :return: Generator of zone file text (str)
+    """
+    records = Record.objects.filter(domain=domain)
+
+    yield '; Zone {} exported {}\n'.format(domain.name, timezone.now().isoformat())
+    yield '$ORIGIN {}\n'.format(qualify(domain.name))
+
+    for record in records.filter(type=RecordType.SOA):
+        yield format_record(record) + '\n'
+
+    for chunk in iter_chunks(records.exclude(type=RecordType.SOA), chunk_size):
+        yield ''.join(format_record(record) + '\n' for record in chunk)
+
+
+def parse_zone_file(domain, text):
+    """
+    Parse a zone file (RFC 1035 master file format) for a domain.
+
+    Relative names are relative to the domain. Names are returned fully
+    qualified, including those outside of the domain (which dnspython would
+    drop silently), so that import_records can report them.
+
+    :param domain: Domain
+    :param text: Zone file (str)
+    :return: Generator of tuples (name, type, content, ttl, prio)
+    :raises ZoneImportError: Unparseable zone file
+    """
+    def zone_factory(origin, rdclass, relativize):
+        # the zone itself is rooted, so that no owner name is outside of it
+        return dns.zone.Zone(dns.name.root, rdclass, relativize)
+
+    try:
+        zone = dns.zone.from_text(text, origin=qualify(domain.name), relativize=False,
+                                  zone_factory=zone_factory, check_origin=False)
+    except dns.exception.DNSException as exc:
+        raise ZoneImportError([(0, str(exc) or exc.__class__.__name__)])
+
+    for name, ttl, rdata in zone.iterate_rdatas():
+        rr_type = dns.rdatatype.to_text(rdata.rdtype)
+        content = rdata.to_text()
+        prio = None
+
+        if rr_type in (RecordType.MX, RecordType.SRV):
+            prio, content = content.split(None, 1)
+
+        if rr_type in HOSTNAME_TYPES:
+            fields = content.split()
+            fields[-1] = fields[-1].rstrip('.')
+            content = ' '.join(fields)
+
+        yield name.to_text(), rr_type, content, ttl, prio
+
+
+def parse_csv(text):
+    """
+    Parse CSV records with the columns name, type, content, TTL and priority.
+
+    TTL and priority are optional. A header row is skipped.
+
+    :param text: CSV data (str)
+    :return: Generator of tuples (name, type, content, ttl, prio)
+    """
+    for index, row in enumerate(csv.reader(text.splitlines())):
+        if not row or (index == 0 and row[0].strip().lower() == 'name'):
+            continue
+
+        row = [c.strip() for c in row] + [''] * (5 - len(row))
+        yield tuple(row[:5])
+
+
+def import_records(domain, entries, owner, chunk_size=1000):
+    """
+    Import records into a domain.
+
+    All entries are validated like records created through the web form
+    before anything is written. Records are then inserted with bulk_create
+    in chunks within a single transaction, followed by a single update of
+    the SOA serial. SOA records and name servers of the domain itself are
+    managed by YDNS and skipped, as are records with the same name, type and
+    content as an existing or previous one (so that an export can be imported
+    again). Fully qualified names (ending with a dot) outside of the domain
+    are invalid.
+
+    :param domain: Domain
+    :param entries: Iterable of tuples (name, type, content, ttl, prio)
+    :param owner: Owner of the new records (User or None)
+    :param chunk_size: Number of records inserted at once (int)
+    :return: Number of imported records (int)
+    :raises ZoneImportError: Invalid entries
+    """
+    errors = []
+    records = []
+    now = timezone.now()
+    entries = list(entries)
+    families = ip_families([entry[2] for entry in entries])
+    existing = set(Record.objects.filter(domain=domain).values_list('name', 'type', 'content').iterator())
+
+    for index, (name, rr_type, content, ttl, prio) in enumerate(entries, 1):
+        try:
+            try:
+                record_type = RecordType(str(rr_type).upper())
+            except ValueError:
+                raise ValidationError('Unsupported record type {}'.format(rr_type))
+
+            if name.endswith('.') and not is_in_domain(domain, name):
+                raise ValidationError('{} is outside of the domain'.format(name))
+
+            name = make_record_name(domain, name)
+
+            if record_type == RecordType.SOA or (record_type == RecordType.NS and name == domain.name):
+                continue
+            elif not record_type.is_usable:
+                raise ValidationError('Unsupported record type {}'.format(rr_type))
+
+            content = validate_content(record_type, content, families[index - 1])
+            key = (name, str(record_type), content)
+
+            if key in existing:
+                continue
+
+            existing.add(key)
+            records.append(Record(domain=domain,
+                                  name=name,
+                                  type=record_type,
+                                  content=content,
+                                  ttl=validate_number(ttl),
+                                  prio=validate_number(prio, required=record_type == RecordType.MX),
+                                  owner=owner,
+                                  date_created=now,
+                                  date_modified=now))
+        except (ValidationError, UnicodeError) as exc:
+            messages = exc.messages if isinstance(exc, ValidationError) else [str(exc)]
+            errors.append((index, '; '.join(messages)))
+
+    if errors:
+        raise ZoneImportError(errors)
+
+    with transaction.atomic():
+        for i in range(0, len(records), chunk_size):
+            Record.objects.bulk_create(records[i:i + chunk_size])
+
+        if records:
+            update_serial(domain)
+
+    for name in set(record.name for record in records):  # bulk_create doesn't send signals
+        record_cache.invalidate(name)
+
+    if owner is not None:
+        invalidate_user_domains(owner.id)
+
+    return len(records)
\ No newline at end of file
@@ -135,7 +135,7 @@ if [ "$current_ip" != "$last_ip" ]; then
 			exit 90
 			;;
 
-		ok)
+		ok|nochg)
 			write_msg "YDNS host updated successfully: $YDNS_HOST ($current_ip)"
 			echo "$current_ip" > $YDNS_LASTIP_FILE
 			exit 0
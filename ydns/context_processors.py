@@ -33,8 +33,6 @@ def navbar_context(request):
     d = {}
 
     if hasattr(request, 'navbar_context'):
-        nc = request.navbar_context
-        if nc:
-            d['navbar_context_html'] = nc
+        d['navbar_context_html'] = request.navbar_context
 
     return d
\ No newline at end of file
@@ -0,0 +1,102 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.core.management.base import BaseCommand
+from netaddr import AddrConversionError, AddrFormatError, IPAddress
+from optparse import make_option
+from ydns.utils.ip import INVALID, ip_families
+
+import ipaddress
+import random
+import time
+
+
+class Command(BaseCommand):
+    """
+    This management command compares validating IP addresses with one
+    netaddr.IPAddress object per value to the batched validator in
+    ydns.utils.ip. No database access is required.
+    """
+    help = 'Benchmark IP address validation'
+    option_list = BaseCommand.option_list + (
+        make_option('-n',
+                    action='store',
+                    type='int',
+                    dest='count',
+                    default=100000,
+                    help='Number of addresses'),
+    )
+
+    @staticmethod
+    def make_addresses(count):
+        """
+        Generate a mix of IPv4, IPv6 and invalid addresses.
+
+        :param count: Number of addresses (int)
+        :return: list of str
+        """
+        rnd = random.Random(count)
+        values = []
+
+        for i in range(count):
+            kind = i % 4
+
+            if kind < 2:
+                values.append(str(ipaddress.IPv4Address(rnd.getrandbits(32))))
+            elif kind == 2:
+                values.append(str(ipaddress.IPv6Address(rnd.getrandbits(128))))
+            else:
+                values.append('host-{}.example.com'.format(rnd.getrandbits(16)))
+
+        return values
+
+    @staticmethod
+    def netaddr_families(values):
+        families = []
+
+        for value in values:
+            try:
+                families.append(IPAddress(value).version)
+            except (AddrConversionError, AddrFormatError):
+                families.append(INVALID)
+
+        return families
+
+    def handle(self, *args, **options):
+        values = self.make_addresses(options['count'])
+
+        start = time.perf_counter()
+        before = self.netaddr_families(values)
+        t_before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        after = ip_families(values)
+        t_after = time.perf_counter() - start
+
+        mismatches = sum(1 for a, b in zip(before, after) if a != b)
+
+        self.stdout.write('netaddr.IPAddress: {:10.3f} s'.format(t_before))
+        self.stdout.write('ip_families:       {:10.3f} s'.format(t_after))
+        self.stdout.write('Speedup:           {:10.1f}x'.format(t_before / t_after if t_after else 0))
+        self.stdout.write('Mismatches:        {:10d}'.format(mismatches))
\ No newline at end of file
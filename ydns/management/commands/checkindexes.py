@@ -0,0 +1,127 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from accounts.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from domains.records.models import Host, Record, Update
+from ydns.models import Message
+
+
+class Command(BaseCommand):
+    """
+    This management command checks that the hot queries of YDNS are
+    answered using indexes, by inspecting their query plans.
+
+    The queries are the host lookup of the update API, the record list of
+    a domain, the update history of a record and the user journal. Only
+    the query plans are examined, so the database does not need to
+    contain any data. Sequential scans are discouraged on PostgreSQL, so
+    that the check doesn't depend on table statistics.
+
+    The command fails if any query plan does not use an index, which makes
+    it suitable to be run after schema changes.
+    """
+    help = 'Check that hot queries use indexes'
+
+    @staticmethod
+    def get_queries():
+        """
+        Get the queries to be checked.
+
+        :return: list of tuples (description, QuerySet)
+        """
+        seek = Q(name__gt='host.example.com') | Q(name='host.example.com', id__gt=1)
+
+        return [
+            ('Update API host lookup', Host.load_records(['host.example.com'])),
+            ('Record list', Record.objects.filter(domain_id=1).order_by('name', 'id')[:26]),
+            ('Record list (next page)', Record.objects.filter(seek, domain_id=1).order_by('name', 'id')[:26]),
+            ('Record update history', Update.objects.filter(record_id=1).order_by('-date_created')),
+            ('User journal', Message.objects.filter(user_id=1).order_by('-date_created', '-id')[:51]),
+            ('API password lookup', User.objects.filter(api_password_prefix='abcdefgh')),
+        ]
+
+    @staticmethod
+    def explain(queryset):
+        """
+        Get the query plan of a queryset.
+
+        :param queryset: QuerySet
+        :return: Query plan (str)
+        """
+        sql, params = queryset.query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+                return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+            elif connection.vendor == 'postgresql':
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('EXPLAIN ' + sql, params)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+            elif connection.vendor == 'mysql':
+                cursor.execute('EXPLAIN ' + sql, params)
+                columns = [c[0] for c in cursor.description]
+                return '\n'.join('key={}'.format(dict(zip(columns, row))['key']) for row in cursor.fetchall())
+
+        raise CommandError('Query plans of {} databases are not supported.'.format(connection.vendor))
+
+    @staticmethod
+    def uses_index(plan):
+        """
+        Return whether every table access of a query plan uses an index.
+
+        :param plan: Query plan (str)
+        :return: bool
+        """
+        if connection.vendor == 'sqlite':
+            scans = [line for line in plan.splitlines() if line.startswith(('SCAN', 'SEARCH'))]
+            return all('INDEX' in line or 'PRIMARY KEY' in line for line in scans)
+        elif connection.vendor == 'postgresql':
+            return 'Seq Scan' not in plan
+        else:
+            return 'key=None' not in plan
+
+    def handle(self, *args, **options):
+        failed = []
+
+        with transaction.atomic():
+            for description, queryset in self.get_queries():
+                plan = self.explain(queryset)
+                ok = self.uses_index(plan)
+
+                self.stdout.write('{}: {}'.format(description, 'OK' if ok else 'NO INDEX'))
+
+                if not ok or options['verbosity'] > 1:
+                    for line in plan.splitlines():
+                        self.stdout.write('    ' + line)
+
+                if not ok:
+                    failed.append(description)
+
+        if failed:
+            raise CommandError('{} quer{} without index: {}'.format(len(failed), 'y' if len(failed) == 1 else 'ies',
+                                                                   ', '.join(failed)))
\ No newline at end of file
@@ -0,0 +1,137 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from domains.records.models import Update
+from optparse import make_option
+from ydns.models import Message
+from ydns.utils.db import delete_in_chunks, iter_chunks
+from ydns.utils.journal import JournalWriter
+
+import gzip
+import json
+import os
+
+
+class Command(BaseCommand):
+    """
+    This management command deletes journal messages and record updates
+    which are older than the retention period (settings.JOURNAL_RETENTION_DAYS).
+
+    Rows are processed in chunks ordered by primary key, so that locks are
+    only held for a single chunk. If an archive directory is configured
+    (settings.JOURNAL_ARCHIVE_DIR), each chunk is first appended to a gzip
+    compressed JSON lines file in it (one file per table and run), so that
+    no row is deleted without being exported.
+    """
+    help = 'Delete (and archive) journal messages and record updates exceeding the retention period'
+    option_list = BaseCommand.option_list + (
+        make_option('--days',
+                    action='store',
+                    type='int',
+                    dest='days',
+                    default=None,
+                    help='Retention period in days (defaults to JOURNAL_RETENTION_DAYS)'),
+        make_option('--chunk-size',
+                    action='store',
+                    type='int',
+                    dest='chunk_size',
+                    default=1000,
+                    help='Number of rows exported and deleted at once'),
+        make_option('--archive-dir',
+                    action='store',
+                    dest='archive_dir',
+                    default=None,
+                    help='Archive directory (defaults to JOURNAL_ARCHIVE_DIR)'),
+    )
+    models = (Message, Update)
+
+    @staticmethod
+    def serialize(obj):
+        """
+        Serialize a saved model instance for the archive.
+
+        :param obj: Model instance
+        :return: str
+        """
+        data = JournalWriter.serialize(obj)
+        data['pk'] = obj.pk
+        return json.dumps(data, cls=DjangoJSONEncoder)
+
+    def archive(self, queryset, path, chunk_size):
+        """
+        Archive and delete the rows of a queryset.
+
+        :param queryset: QuerySet
+        :param path: Archive file (str)
+        :param chunk_size: Number of rows per chunk (int)
+        :return: Number of archived rows (int)
+        """
+        count = 0
+
+        with gzip.open(path, 'at', encoding='utf-8') as f:
+            for chunk in iter_chunks(queryset, chunk_size):
+                for obj in chunk:
+                    f.write(self.serialize(obj) + '\n')
+                f.flush()
+
+                queryset.model.objects.filter(pk__in=[obj.pk for obj in chunk]).delete()
+                count += len(chunk)
+
+        return count
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.JOURNAL_RETENTION_DAYS
+
+        if not days:
+            self.stdout.write('Journal retention is disabled.')
+            return
+        elif days < 0:
+            raise CommandError('The retention period must not be negative.')
+
+        archive_dir = options['archive_dir'] or settings.JOURNAL_ARCHIVE_DIR
+
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+
+        now = timezone.now()
+        cutoff = now - timedelta(days=days)
+
+        for model in self.models:
+            queryset = model.objects.filter(date_created__lt=cutoff)
+
+            if archive_dir:
+                path = os.path.join(archive_dir, '{}-{}.jsonl.gz'.format(model._meta.db_table,
+                                                                         now.strftime('%Y%m%d%H%M%S')))
+                count = self.archive(queryset, path, options['chunk_size'])
+                verb = 'archived'
+            else:
+                count = delete_in_chunks(queryset, options['chunk_size'])
+                verb = 'deleted'
+
+            self.stdout.write('{}: {} row{} {}.'.format(model._meta.db_table, count, '' if count == 1 else 's', verb))
\ No newline at end of file
@@ -0,0 +1,91 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from optparse import make_option
+from ydns.utils.mail import send_queued_mail
+
+import time
+
+
+class Command(BaseCommand):
+    """
+    This management command sends the messages of the mail queue in
+    batches over a single SMTP connection per batch. It either drains the
+    queue once (e.g. from cron) or keeps polling it with --loop.
+    """
+    help = 'Send queued email messages'
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size',
+                    action='store',
+                    type='int',
+                    dest='batch_size',
+                    default=settings.MAIL_QUEUE_BATCH_SIZE,
+                    help='Number of messages sent over one connection'),
+        make_option('--loop',
+                    action='store_true',
+                    dest='loop',
+                    default=False,
+                    help='Keep polling the queue'),
+        make_option('--interval',
+                    action='store',
+                    type='float',
+                    dest='interval',
+                    default=5,
+                    help='Seconds to wait between polls of an empty queue (with --loop)'),
+    )
+
+    def drain(self, batch_size):
+        """
+        Send batches until no due message is left.
+
+        :param batch_size: Number of messages per batch (int)
+        :return: tuple of (sent, failed) message counts
+        """
+        total_sent = total_failed = 0
+
+        while True:
+            sent, failed = send_queued_mail(batch_size=batch_size,
+                                            max_attempts=settings.MAIL_QUEUE_MAX_ATTEMPTS,
+                                            retry_delay=settings.MAIL_QUEUE_RETRY_DELAY)
+            total_sent += sent
+            total_failed += failed
+
+            if sent + failed < batch_size:
+                return total_sent, total_failed
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = self.drain(options['batch_size'])
+
+            if sent or failed or not options['loop']:
+                self.stdout.write('{} message{} sent, {} failed.'.format(sent, '' if sent == 1 else 's', failed))
+
+            if not options['loop']:
+                break
+
+            connection.close()
+            time.sleep(options['interval'])
\ No newline at end of file
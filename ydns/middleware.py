@@ -22,18 +22,54 @@
 # SOFTWARE.
 ##
 
+from django.db import connections
+from django.utils.functional import cached_property
 from django.utils.safestring import mark_safe
 
 
+class LazyNavbarContext(object):
+    """
+    Navbar content of a request, generated on first use.
+
+    The content is taken from the view instance dispatched for the request,
+    so responses which never render the navbar (redirects, JSON, API calls)
+    do not pay for it.
+    """
+
+    def __init__(self, request):
+        self.request = request
+
+    @cached_property
+    def html(self):
+        view = getattr(self.request, 'view', None)
+
+        if view is not None and hasattr(view, 'get_navbar_context'):
+            return ContextualNavigationMiddleware.make_html(view.get_navbar_context())
+
+        return mark_safe('')
+
+    def __html__(self):
+        return self.html
+
+    def __str__(self):
+        return self.html
+
+    def __bool__(self):
+        return bool(self.html)
+
+    __nonzero__ = __bool__
+
+
 class ContextualNavigationMiddleware(object):
     """
     A middleware for contextual navigation.
 
-    Each class based view can define a static method called "get_navbar_context"
+    Each class based view can define a method called "get_navbar_context"
     to provide one or more links to be added to the navigation bar.
 
     A context processor will grab the generated content to display in the
-    templates if appropriately.
+    templates if appropriately. The content is generated lazily by the
+    dispatched view instance (see LazyNavbarContext).
     """
 
     @classmethod
@@ -48,15 +84,7 @@ class ContextualNavigationMiddleware(object):
         :return: None
         """
         if hasattr(view_func, 'cls'):
-            instance = view_func.cls(**view_func.cls_kwargs)
-            instance.request = request
-            instance.args = view_args
-            instance.kwargs = view_kwargs
-
-            if hasattr(instance, 'get_navbar_context'):
-                nc = instance.get_navbar_context()
-                if nc:
-                    request.navbar_context = cls.make_html(nc)
+            request.navbar_context = LazyNavbarContext(request)
 
         return None
 
@@ -74,4 +102,55 @@ class ContextualNavigationMiddleware(object):
             for element in nc:
                 s += element.__html__()
 
-        return mark_safe(s)
\ No newline at end of file
+        return mark_safe(s)
+
+
+class QueryCountMiddleware(object):
+    """
+    A middleware counting the database queries of a request.
+
+    The count is stored as "query_count" on the request and returned in the
+    "X-Query-Count" response header. Django only logs queries if DEBUG is
+    enabled, so logging is forced on every connection for the duration of
+    the request (Django < 2.0 has no execute_wrapper to count them without
+    logging). The log is limited and cleared at the start of each request.
+    """
+
+    @classmethod
+    def process_request(cls, request):
+        """
+        Process a request.
+
+        :param request: HttpRequest
+        """
+        request._query_log_state = {}
+
+        for conn in connections.all():
+            request._query_log_state[conn.alias] = (conn.force_debug_cursor, len(conn.queries_log))
+            conn.force_debug_cursor = True
+
+    @classmethod
+    def process_response(cls, request, response):
+        """
+        Process a response.
+
+        :param request: HttpRequest
+        :param response: HttpResponse
+        :return: HttpResponse
+        """
+        state = getattr(request, '_query_log_state', None)
+
+        if state is None:
+            return response
+
+        count = 0
+
+        for conn in connections.all():
+            if conn.alias in state:
+                force_debug_cursor, offset = state[conn.alias]
+                count += len(conn.queries_log) - offset
+                conn.force_debug_cursor = force_debug_cursor
+
+        request.query_count = count
+        response['X-Query-Count'] = str(count)
+        return response
\ No newline at end of file
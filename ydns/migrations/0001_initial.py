@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.conf import settings
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Message',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('message', models.TextField()),
+                ('user', models.ForeignKey(related_name='ref+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'messages',
+                'ordering': ('date_created',),
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+import ydns.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ydns', '0002_message_user_date_created_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedMail',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('date_created', models.DateTimeField(default=django.utils.timezone.now)),
+                ('subject', models.TextField()),
+                ('body', models.TextField()),
+                ('from_email', models.TextField(null=True)),
+                ('recipients', ydns.fields.JsonField()),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt', models.DateTimeField(null=True, db_index=True, default=django.utils.timezone.now)),
+                ('last_error', models.TextField(null=True)),
+            ],
+            options={
+                'db_table': 'mail_queue',
+                'ordering': ('id',),
+            },
+        ),
+    ]
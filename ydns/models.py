@@ -24,13 +24,37 @@
 
 from django.db import models
 from django.utils import timezone
+from .fields import JsonField
 
 
 class Message(models.Model):
     class Meta:
         db_table = 'messages'
         ordering = ('date_created',)
+        index_together = (
+            ('user', 'date_created'),
+        )
 
     user = models.ForeignKey('accounts.User', on_delete=models.CASCADE, related_name='ref+')
     date_created = models.DateTimeField(default=timezone.now)
-    message = models.TextField()
\ No newline at end of file
+    message = models.TextField()
+
+
+class QueuedMail(models.Model):
+    """
+    Outgoing email waiting to be sent by the sendqueuedmail command.
+
+    A message whose next_attempt is None has exhausted its attempts.
+    """
+    class Meta:
+        db_table = 'mail_queue'
+        ordering = ('id',)
+
+    date_created = models.DateTimeField(default=timezone.now)
+    subject = models.TextField()
+    body = models.TextField()
+    from_email = models.TextField(null=True)
+    recipients = JsonField()
+    attempts = models.IntegerField(default=0)
+    next_attempt = models.DateTimeField(null=True, default=timezone.now, db_index=True)
+    last_error = models.TextField(null=True)
\ No newline at end of file
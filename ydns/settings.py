@@ -22,6 +22,7 @@ INSTALLED_APPS = (
     'ydns',
 )
 MIDDLEWARE_CLASSES = (
+    'ydns.middleware.QueryCountMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -37,7 +38,8 @@ ROOT_URLCONF = 'ydns.urls'
 WSGI_APPLICATION = 'ydns.wsgi.application'
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'ydns.utils.templates.InstrumentedDjangoTemplates',
+        'NAME': 'django',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': False,
         'OPTIONS': {
@@ -62,7 +64,113 @@ STATICFILES_DIRS = (
 )
 AUTH_USER_MODEL = 'accounts.User'
 
+# Seconds to cache total counts of paginated lists
+PAGINATION_COUNT_CACHE_TTL = 60
+
+# Resolver for delegation checks; an empty list of name servers uses the system resolvers
+DNS_RESOLVER_NAMESERVERS = []
+DNS_RESOLVER_PORT = 53
+DNS_RESOLVER_TIMEOUT = 2
+DNS_RESOLVER_LIFETIME = 3
+DNS_RESOLVER_WORKERS = 4
+
+# Cache for delegation check results (entries, seconds)
+DNS_CACHE_SIZE = 1024
+DNS_CACHE_MAX_TTL = 3600
+DNS_NEGATIVE_CACHE_TTL = 60
+
+# Periodic delegation checks (see the checkdomains command): seconds between checks
+# of a domain, concurrent lookups and queries per second and resolver
+DOMAIN_CHECK_INTERVAL = 86400
+DOMAIN_CHECK_WORKERS = 32
+DOMAIN_CHECK_RATE = 50
+
+# In-process cache of records by name and type (entries, seconds); 0 disables the cache.
+# Other processes are not notified of changes, so only enable it for a single process
+# or with a short TTL.
+RECORD_CACHE_SIZE = 0
+RECORD_CACHE_TTL = 30
+
+# Queue outgoing mail instead of sending it directly (messages per connection, attempts per
+# message, seconds before the first retry); the queue requires running the sendqueuedmail
+# command, e.g. from cron or with --loop, otherwise no mail is sent at all
+MAIL_QUEUE_ENABLED = False
+MAIL_QUEUE_BATCH_SIZE = 100
+MAIL_QUEUE_MAX_ATTEMPTS = 8
+MAIL_QUEUE_RETRY_DELAY = 60
+
+# Cache for verified API credentials (entries, seconds)
+API_AUTH_CACHE_SIZE = 10000
+API_AUTH_CACHE_TTL = 900
+
+# Maximum number of updates within a single batch update request
+API_BATCH_MAX_SIZE = 1000
+
+# Write-behind journal (entries, seconds); a buffer size of 0 writes entries immediately
+JOURNAL_BUFFER_SIZE = 100
+JOURNAL_FLUSH_INTERVAL = 5
+
+# Directory (e.g. /var/spool/ydns) where queued journal entries are spooled, so that they can
+# be recovered with the replayjournal command after a crash; None keeps them in memory only.
+# If the directory cannot be written, entries are saved immediately.
+JOURNAL_SPOOL_DIR = None
+
+# Sync spool files to disk after every entry, so that queued entries also survive a crash of
+# the host (not only of the process) at the cost of a disk sync per entry
+JOURNAL_SPOOL_FSYNC = False
+
+# Days to keep journal messages and record updates (see the prunejournal command); 0 keeps them forever
+JOURNAL_RETENTION_DAYS = 365
+
+# Directory expired journal messages and record updates are exported to as compressed files
+# before they are deleted; None deletes them without an export
+JOURNAL_ARCHIVE_DIR = None
+
+# Minimum number of seconds between SOA serial updates of a domain (0 updates immediately)
+SOA_SERIAL_INTERVAL = 10
+
+# Number of seconds the list of domains of a user (e.g. on the dashboard) is cached; 0 disables the cache.
+# Invalidation only reaches the configured cache backend; the default one is per process, so only
+# enable it with a shared backend (see CACHES) when running several processes.
+USER_DOMAINS_CACHE_TTL = 0
+
+# Outgoing HTTP requests: connections kept per host, seconds between latency statistics
+# being logged (0 disables the statistics)
+HTTP_POOL_SIZE = 10
+HTTP_STATS_INTERVAL = 3600
+
+# reCAPTCHA verification: (connect, read) timeout in seconds, retries on connection
+# errors, and cache for rejected responses (entries, seconds)
+RECAPTCHA_VERIFY_URL = 'https://www.google.com/recaptcha/api/siteverify'
+RECAPTCHA_TIMEOUT = (3.05, 5)
+RECAPTCHA_RETRIES = 2
+RECAPTCHA_CACHE_SIZE = 1000
+RECAPTCHA_CACHE_TTL = 120
+
+# OAuth2 sign-in: (connect, read) timeout in seconds and retries on connection errors
+# for requests to the providers
+OAUTH_TIMEOUT = (3.05, 10)
+OAUTH_RETRIES = 1
+
+# Number of distinct user agents whose parse results are cached; whether the parsed user
+# agent is stored along with record updates (so that rendering the history needs no parsing)
+USER_AGENT_CACHE_SIZE = 1024
+USER_AGENT_STORE_PARSED = True
+
+# Cache compiled templates in memory (None enables the cache unless DEBUG is set)
+TEMPLATE_CACHE = None
+
+# Seconds between template render statistics being logged; 0 disables the statistics
+TEMPLATE_STATS_INTERVAL = 3600
+
 try:
     from .local_settings import *
 except ImportError:
-    raise
\ No newline at end of file
+    raise
+
+if TEMPLATE_CACHE or (TEMPLATE_CACHE is None and not DEBUG):
+    TEMPLATES[0]['OPTIONS'].setdefault('loaders', [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+        ]),
+    ])
\ No newline at end of file
@@ -0,0 +1,98 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.db import connection
+from threading import Lock, Thread
+
+import atexit
+import logging
+import os
+import time
+
+__all__ = ['PeriodicFlusher']
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicFlusher(object):
+    """
+    Base class for buffers that are flushed by a background thread.
+
+    The thread is started lazily once per process, which includes forked
+    worker processes, and calls flush() every `interval` seconds.
+    Pending work is flushed as well when the process exits.
+    """
+
+    def __init__(self, interval):
+        """
+        Initialize flusher.
+
+        :param interval: Flush interval in seconds (int, float)
+        """
+        self.interval = interval
+        self._lock = Lock()
+        self._pid = None
+        self._thread = None
+
+    def flush(self):
+        """
+        Process buffered work. Must be implemented by subclasses.
+        """
+        raise NotImplementedError()
+
+    def reset(self):
+        """
+        Reset the buffer state when started in a new process.
+        """
+        pass
+
+    def start(self):
+        """
+        Start the flush thread unless it is running in this process already.
+        The caller must hold the lock.
+
+        :return: Whether the thread has been started (bool)
+        """
+        if self._pid == os.getpid():
+            return False
+
+        self._pid = os.getpid()
+        self.reset()
+
+        self._thread = Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+        atexit.register(self.flush)
+        return True
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('%s flush failed', type(self).__name__)
+            finally:
+                connection.close()
\ No newline at end of file
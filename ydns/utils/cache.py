@@ -0,0 +1,161 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from collections import OrderedDict
+from threading import Lock
+
+import time
+
+__all__ = ['ExpiringCache']
+
+
+class ExpiringCache(object):
+    """
+    Bounded in-process cache with LRU eviction and per-entry expiry.
+
+    The cache is safe to be shared between threads of the same process.
+    """
+
+    def __init__(self, max_size=1024, ttl=300):
+        """
+        Initialize cache instance.
+
+        :param max_size: Maximum number of entries (int)
+        :param ttl: Default time to live in seconds (int, float)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def delete(self, key):
+        """
+        Remove an entry from the cache.
+
+        :param key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_matching(self, func):
+        """
+        Remove all entries whose value matches a predicate.
+
+        :param func: Predicate, called with the cached value (callable)
+        :return: Number of removed entries (int)
+        """
+        with self._lock:
+            keys = [k for k, (v, _) in self._data.items() if func(v)]
+
+            for k in keys:
+                del self._data[k]
+
+        return len(keys)
+
+    def delete_matching_keys(self, func):
+        """
+        Remove all entries whose key matches a predicate.
+
+        :param func: Predicate, called with the key (callable)
+        :return: Number of removed entries (int)
+        """
+        with self._lock:
+            keys = [k for k in self._data if func(k)]
+
+            for k in keys:
+                del self._data[k]
+
+        return len(keys)
+
+    def get(self, key, default=None):
+        """
+        Get an entry from the cache.
+
+        :param key: Cache key
+        :param default: Value to return if the key is unknown or expired
+        :return: Cached value or default
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            try:
+                value, expires = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            if expires <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """
+        Add or replace an entry.
+
+        :param key: Cache key
+        :param value: Value
+        :param ttl: Time to live in seconds, overrides the default (int, float)
+        """
+        if self.max_size <= 0:
+            return
+
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def stats(self):
+        """
+        Return cache statistics.
+
+        :return: dict
+        """
+        total = self.hits + self.misses
+
+        return {'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0}
\ No newline at end of file
@@ -0,0 +1,85 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+__all__ = ['delete_in_chunks', 'iter_chunks']
+
+
+def iter_chunks(queryset, chunk_size=1000):
+    """
+    Iterate a queryset in chunks ordered by primary key.
+
+    Every chunk is fetched with a seek on the primary key, so that the cost
+    of a chunk does not depend on its position and no server-side cursor
+    has to be held open.
+
+    :param queryset: QuerySet
+    :param chunk_size: Number of objects per chunk (int)
+    :return: Generator of lists
+    """
+    last_pk = None
+
+    while True:
+        qs = queryset.order_by('pk')
+
+        if last_pk is not None:
+            qs = qs.filter(pk__gt=last_pk)
+
+        chunk = list(qs[:chunk_size])
+
+        if not chunk:
+            break
+
+        yield chunk
+        last_pk = chunk[-1].pk
+
+        if len(chunk) < chunk_size:
+            break
+
+
+def delete_in_chunks(queryset, chunk_size=1000):
+    """
+    Delete the objects of a queryset in chunks.
+
+    Rows are deleted by primary key in separate statements, so that large
+    deletions don't hold locks on the table for a long time.
+
+    :param queryset: QuerySet
+    :param chunk_size: Number of objects per statement (int)
+    :return: Number of deleted objects (int)
+    """
+    count = 0
+
+    while True:
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:chunk_size])
+
+        if not pks:
+            break
+
+        queryset.model.objects.filter(pk__in=pks).delete()
+        count += len(pks)
+
+        if len(pks) < chunk_size:
+            break
+
+    return count
\ No newline at end of file
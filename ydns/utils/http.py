@@ -22,7 +22,15 @@
 # SOFTWARE.
 ##
 
+from django.conf import settings
 from django.core.urlresolvers import reverse
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3.util.retry import Retry
+from .stats import TimingStats
+
+import requests
+import time
 
 
 def absolute_url(request, url, suffix=None, *args, **kwargs):
@@ -43,4 +51,106 @@ def absolute_url(request, url, suffix=None, *args, **kwargs):
 
     scheme = 'https' if request.is_secure() else 'http'
 
-    return scheme + '://' + request.get_host() + real_url
\ No newline at end of file
+    return scheme + '://' + request.get_host() + real_url
+
+
+def request_cached(request, key, func):
+    """
+    Get a value that is computed at most once per request.
+
+    This allows views, middleware and templates to share objects (such as
+    database rows) which are required multiple times during a request.
+
+    :param request: HttpRequest
+    :param key: Cache key (hashable)
+    :param func: Function computing the value (callable)
+    :return: Value
+    """
+    cache = request.__dict__.setdefault('_request_cache', {})
+
+    if key not in cache:
+        cache[key] = func()
+
+    return cache[key]
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with a default timeout and latency statistics per host.
+
+    Requests without an explicit timeout use the adapter timeout, so no
+    request is able to hang forever.
+    """
+
+    def __init__(self, timeout, stats=None, **kwargs):
+        """
+        Initialize adapter.
+
+        :param timeout: Default (connect, read) timeout in seconds (tuple, float)
+        :param stats: Latency statistics (TimingStats, optional)
+        :param kwargs: Keyword arguments passed to HTTPAdapter
+        """
+        self.timeout = timeout
+        self.stats = stats
+        super(TimeoutHTTPAdapter, self).__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+
+        start = time.perf_counter()
+
+        try:
+            response = super(TimeoutHTTPAdapter, self).send(request, timeout=timeout, **kwargs)
+        except Exception:
+            if self.stats:
+                self.stats.add(urlsplit(request.url).hostname, time.perf_counter() - start, error=True)
+            raise
+
+        if self.stats:
+            self.stats.add(urlsplit(request.url).hostname, time.perf_counter() - start, error=response.status_code >= 500)
+
+        return response
+
+
+def make_adapter(timeout, retries=0, pool_size=10, stats=None):
+    """
+    Create a keep-alive HTTP adapter with timeouts and bounded retries.
+
+    Connection errors are retried for all methods, as the request has not
+    been sent yet. Server errors (HTTP 502-504) are only retried for
+    idempotent methods, so e.g. a POST consuming a one-time token is never
+    sent twice. Requests are never retried after a read error or timeout.
+
+    :param timeout: Default (connect, read) timeout in seconds (tuple, float)
+    :param retries: Maximum number of retries (int)
+    :param pool_size: Maximum number of connections kept per host (int)
+    :param stats: Latency statistics (TimingStats, optional), defaults to request_stats
+    :return: TimeoutHTTPAdapter
+    """
+    retry = Retry(total=retries, connect=retries, read=0, status=retries,
+                  status_forcelist=(502, 503, 504),
+                  backoff_factor=0.1, raise_on_status=False)
+
+    return TimeoutHTTPAdapter(timeout, stats=stats or request_stats, max_retries=retry,
+                              pool_connections=pool_size, pool_maxsize=pool_size)
+
+
+def make_session(adapter, session_class=requests.Session, **kwargs):
+    """
+    Create a session which uses an adapter for HTTP and HTTPS.
+
+    :param adapter: HTTPAdapter
+    :param session_class: Session class (type)
+    :param kwargs: Keyword arguments passed to the session class
+    :return: requests.Session
+    """
+    session = session_class(**kwargs)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    return session
+
+
+# Latency statistics of outgoing HTTP requests per host
+request_stats = TimingStats(settings.HTTP_STATS_INTERVAL, 'HTTP')
\ No newline at end of file
@@ -0,0 +1,87 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from array import array
+
+import socket
+
+__all__ = ['INVALID', 'IPV4', 'IPV6', 'ip_families', 'ip_family']
+
+INVALID = 0
+IPV4 = 4
+IPV6 = 6
+
+
+def ip_family(value):
+    """
+    Get the address family of an IP address string.
+
+    Addresses are parsed with inet_pton, so only the canonical textual
+    representations are accepted (e.g. no "127.1" or scoped IPv6 addresses).
+
+    :param value: IP address (str)
+    :return: IPV4, IPV6 or INVALID (int)
+    """
+    try:
+        socket.inet_pton(socket.AF_INET, value)
+    except (OSError, TypeError, ValueError):
+        pass
+    else:
+        return IPV4
+
+    try:
+        socket.inet_pton(socket.AF_INET6, value)
+    except (OSError, TypeError, ValueError):
+        return INVALID
+    else:
+        return IPV6
+
+
+def ip_families(values):
+    """
+    Get the address families of many IP address strings in one pass.
+
+    Strings containing a colon can only be IPv6 addresses, so every value
+    is parsed at most once.
+
+    :param values: IP addresses (iterable of str)
+    :return: IPV4, IPV6 or INVALID per value (array of unsigned char)
+    """
+    result = array('B')
+    append = result.append
+    inet_pton = socket.inet_pton
+    af_inet, af_inet6 = socket.AF_INET, socket.AF_INET6
+
+    for value in values:
+        try:
+            if ':' in value:
+                inet_pton(af_inet6, value)
+                append(IPV6)
+            else:
+                inet_pton(af_inet, value)
+                append(IPV4)
+        except (OSError, TypeError, ValueError):
+            append(INVALID)
+
+    return result
\ No newline at end of file
@@ -0,0 +1,325 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from threading import Lock
+from .background import PeriodicFlusher
+
+import datetime
+import glob
+import json
+import logging
+import os
+
+__all__ = ['JournalEncoder', 'JournalWriter', 'journal_writer']
+
+logger = logging.getLogger(__name__)
+
+
+class JournalEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder for journal entries.
+
+    Unlike DjangoJSONEncoder, datetimes keep their microseconds, so that
+    replayed entries match the logged ones.
+    """
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super(JournalEncoder, self).default(o)
+
+
+class JournalWriter(PeriodicFlusher):
+    """
+    Write-behind buffer for journal entries (e.g. messages and record updates).
+
+    Entries are queued in memory and inserted with bulk_create once the
+    buffer is full or the flush interval has passed. Every queued entry
+    is also appended to a spool file, so entries of a crashed process
+    can be recovered by using replay(). Spool files are only synced to
+    disk if `fsync` is set; otherwise, entries survive a crash of the
+    process, but not necessarily a crash of the host.
+
+    Entries added within a transaction are saved immediately, because a
+    flush from another thread cannot see rows that haven't been committed yet.
+    """
+
+    def __init__(self, max_size=100, interval=5.0, spool_dir=None, fsync=False):
+        """
+        Initialize journal writer.
+
+        :param max_size: Number of queued entries that triggers a flush; 0 disables buffering (int)
+        :param interval: Maximum number of seconds entries stay queued (int, float)
+        :param spool_dir: Directory for spool files or None to disable spooling (str)
+        :param fsync: Whether to sync spool files to disk after every write (bool)
+        """
+        super(JournalWriter, self).__init__(interval)
+        self.max_size = max_size
+        self.spool_dir = spool_dir
+        self.fsync = fsync
+        self._queue = []
+        self._flush_lock = Lock()
+        self._spool = None
+        self._spool_seq = 0
+
+    def add(self, obj):
+        """
+        Add an entry to the journal.
+
+        :param obj: Unsaved model instance
+        :return: Model instance (without primary key if it has been queued)
+        """
+        if self.max_size <= 0 or connection.in_atomic_block:
+            obj.save()
+            return obj
+
+        with self._lock:
+            self.start()
+
+            try:
+                self._enqueue([obj])
+            except OSError:
+                logger.exception('Cannot spool journal entry, saving it immediately')
+                spooled = False
+            else:
+                spooled = True
+
+            full = len(self._queue) >= self.max_size
+
+        if not spooled:
+            obj.save()
+        elif full:
+            self.flush()
+
+        return obj
+
+    def flush(self):
+        """
+        Write all queued entries to the database.
+
+        :return: Number of written entries (int)
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._queue:
+                    return 0
+
+                objects, self._queue = self._queue, []
+                spool_path = self._rotate_spool()
+
+            failed = self.write(objects)
+
+            if failed:
+                with self._lock:
+                    try:
+                        self._enqueue(failed)  # retry with the next flush
+                    except OSError:
+                        logger.exception('Cannot spool %d journal entries, keeping them in memory', len(failed))
+                        self._queue.extend(failed)
+
+            if spool_path:
+                os.remove(spool_path)
+
+            return len(objects) - len(failed)
+
+    def reset(self):
+        """
+        Start with an empty queue and no spool file; entries queued
+        before a fork belong to the parent process.
+        """
+        self._queue = []
+        self._spool = None
+
+    def replay(self):
+        """
+        Write entries of spool files left over by terminated processes.
+
+        :return: Number of written entries (int)
+        """
+        if not self.spool_dir:
+            return 0
+
+        count = 0
+
+        for path in sorted(glob.glob(os.path.join(self.spool_dir, 'journal-*'))):
+            pid = int(os.path.basename(path).split('-')[1].split('.')[0])
+
+            if pid == os.getpid() or self._is_running(pid):
+                continue
+
+            with open(path) as f:
+                objects = [self.deserialize(json.loads(line)) for line in f if line.strip()]
+
+            failed = self.write(objects)
+            count += len(objects) - len(failed)
+
+            if failed:
+                with open(path, 'w') as f:
+                    for obj in failed:
+                        f.write(json.dumps(self.serialize(obj), cls=JournalEncoder) + '\n')
+            else:
+                os.remove(path)
+
+        return count
+
+    @staticmethod
+    def serialize(obj):
+        """
+        Serialize an unsaved model instance.
+
+        :param obj: Model instance
+        :return: dict
+        """
+        meta = obj._meta
+        fields = {}
+
+        for f in meta.concrete_fields:
+            if f.primary_key:
+                continue
+            fields[f.attname] = f.get_prep_value(getattr(obj, f.attname))
+
+        return {'model': '{}.{}'.format(meta.app_label, meta.model_name), 'fields': fields}
+
+    @staticmethod
+    def deserialize(data):
+        """
+        Create an unsaved model instance from serialized data.
+
+        :param data: dict
+        :return: Model instance
+        """
+        model = apps.get_model(data['model'])
+        kwargs = {}
+
+        for f in model._meta.concrete_fields:
+            if f.attname in data['fields']:
+                kwargs[f.attname] = f.to_python(data['fields'][f.attname])
+
+        return model(**kwargs)
+
+    @staticmethod
+    def write(objects):
+        """
+        Insert model instances, using one bulk insert per model.
+
+        If a bulk insert violates a constraint (e.g. because a referenced row
+        has been deleted in the meantime), the instances are saved one by one
+        instead and the offending ones are dropped.
+
+        :param objects: Model instances (list)
+        :return: Instances that couldn't be written due to database errors (list)
+        """
+        by_model = {}
+        failed = []
+
+        for obj in objects:
+            by_model.setdefault(type(obj), []).append(obj)
+
+        for model, items in by_model.items():
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create(items)
+            except IntegrityError:
+                pass
+            except DatabaseError:
+                logger.exception('Bulk insert of %d journal entries failed', len(items))
+                failed.extend(items)
+                continue
+            else:
+                continue
+
+            for obj in items:
+                try:
+                    with transaction.atomic():
+                        obj.save()
+                except IntegrityError:
+                    logger.warning('Dropping journal entry %r', obj, exc_info=True)
+                except DatabaseError:
+                    failed.append(obj)
+
+        return failed
+
+    @staticmethod
+    def _is_running(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def _enqueue(self, objects):
+        """
+        Queue and spool entries. The caller must hold the lock.
+
+        :param objects: Model instances (list)
+        :raises OSError: The spool file cannot be written (nothing is queued)
+        """
+        if self.spool_dir:
+            if self._spool is None:
+                self._open_spool()
+
+            for obj in objects:
+                self._spool.write(json.dumps(self.serialize(obj), cls=JournalEncoder) + '\n')
+            self._spool.flush()
+
+            if self.fsync:
+                os.fsync(self._spool.fileno())
+
+        self._queue.extend(objects)
+
+    def _open_spool(self):
+        """
+        Open the spool file of the process. Spool files are only created once
+        there is an entry to write, so that idle processes leave no files behind.
+        """
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._spool = open(os.path.join(self.spool_dir, 'journal-{}.spool'.format(self._pid)), 'a')
+
+    def _rotate_spool(self):
+        """
+        Close the current spool file; the next entry starts a new one.
+
+        :return: Path of the previous spool file or None
+        """
+        if self._spool is None:
+            return None
+
+        self._spool.close()
+        self._spool_seq += 1
+        path = os.path.join(self.spool_dir, 'journal-{}.{}.flushing'.format(self._pid, self._spool_seq))
+        os.rename(self._spool.name, path)
+        self._spool = None
+        return path
+
+
+journal_writer = JournalWriter(max_size=settings.JOURNAL_BUFFER_SIZE,
+                               interval=settings.JOURNAL_FLUSH_INTERVAL,
+                               spool_dir=settings.JOURNAL_SPOOL_DIR,
+                               fsync=settings.JOURNAL_SPOOL_FSYNC)
\ No newline at end of file
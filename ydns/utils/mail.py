@@ -22,13 +22,26 @@
 # SOFTWARE.
 ##
 
-from django.core.mail import EmailMessage as _EmailMessage
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage as _EmailMessage, get_connection
 from django.template.loader import render_to_string
+from django.utils import timezone
+
+import logging
+
+__all__ = ['EmailMessage', 'send_queued_mail']
+
+logger = logging.getLogger(__name__)
 
 
 class EmailMessage(_EmailMessage):
     """
     Template-based email message.
+
+    If MAIL_QUEUE_ENABLED is set, messages are not sent directly, but added
+    to the mail queue which is processed by the sendqueuedmail command, so
+    that a slow mail server doesn't delay requests.
     """
 
     def __init__(self, subject, tpl, context=None, from_email=None):
@@ -48,6 +61,19 @@ class EmailMessage(_EmailMessage):
                                            body,
                                            from_email=from_email)
 
+    def enqueue(self):
+        """
+        Add the email to the mail queue.
+
+        :return: QueuedMail
+        """
+        from ydns.models import QueuedMail
+
+        return QueuedMail.objects.create(subject=self.subject,
+                                         body=self.body,
+                                         from_email=self.from_email,
+                                         recipients={'to': self.to, 'cc': self.cc, 'bcc': self.bcc})
+
     def send(self, to=None, bcc=None, cc=None, fail_silently=False):
         """
         Send the email to specific recipients.
@@ -56,12 +82,105 @@ class EmailMessage(_EmailMessage):
         :param bcc: Blind carbon copy recipients, BCC header (tuple, list)
         :param cc: Carbon copy recipients, CC header (tuple, list)
         :param fail_silently: Whether to raise an exception on error (bool)
+        :return: Number of queued or sent messages (int)
         """
         if to and isinstance(to, (tuple, list)):
             self.to = list(to)
         if bcc and isinstance(bcc, (tuple, list)):
-            self.bcc = list(to)
+            self.bcc = list(bcc)
         if cc and isinstance(cc, (tuple, list)):
             self.cc = list(cc)
 
-        return super(EmailMessage, self).send(fail_silently=fail_silently)
\ No newline at end of file
+        if not settings.MAIL_QUEUE_ENABLED:
+            return super(EmailMessage, self).send(fail_silently=fail_silently)
+        elif not self.recipients():
+            return 0
+
+        self.enqueue()
+        return 1
+
+
+def claim_queued_mail(batch_size, lease=300):
+    """
+    Claim due messages of the mail queue.
+
+    Messages are claimed by moving their next attempt into the future with
+    a conditional UPDATE, so that concurrent workers don't send them twice.
+
+    :param batch_size: Maximum number of messages (int)
+    :param lease: Seconds until a claimed message may be claimed again (int)
+    :return: list of QueuedMail
+    """
+    from ydns.models import QueuedMail
+
+    now = timezone.now()
+    claimed = []
+
+    for mail in QueuedMail.objects.filter(next_attempt__lte=now).order_by('next_attempt', 'id')[:batch_size]:
+        until = now + timedelta(seconds=lease)
+
+        if QueuedMail.objects.filter(id=mail.id, next_attempt=mail.next_attempt).update(next_attempt=until):
+            mail.next_attempt = until
+            claimed.append(mail)
+
+    return claimed
+
+
+def send_queued_mail(batch_size=100, max_attempts=8, retry_delay=60, connection=None):
+    """
+    Send a batch of messages of the mail queue over a single connection.
+
+    Sent messages are removed from the queue. Failed messages are retried
+    with exponential backoff (retry_delay * 2 ^ (attempts - 1) seconds)
+    until max_attempts is reached; they are kept with the error afterwards.
+
+    :param batch_size: Maximum number of messages (int)
+    :param max_attempts: Maximum number of attempts per message (int)
+    :param retry_delay: Seconds to wait before the first retry (int)
+    :param connection: Mail backend (optional)
+    :return: tuple of (sent, failed) message counts
+    """
+    mails = claim_queued_mail(batch_size)
+    sent = failed = 0
+
+    if not mails:
+        return sent, failed
+
+    if connection is None:
+        connection = get_connection()
+
+    try:
+        for mail in mails:
+            message = _EmailMessage(mail.subject,
+                                    mail.body,
+                                    from_email=mail.from_email,
+                                    to=mail.recipients.get('to'),
+                                    cc=mail.recipients.get('cc'),
+                                    bcc=mail.recipients.get('bcc'),
+                                    connection=connection)
+
+            try:
+                connection.open()
+                message.send()
+            except Exception as exc:
+                # drop the connection, it is reopened for the next message
+                connection.close()
+
+                mail.attempts += 1
+                mail.last_error = '{}: {}'.format(exc.__class__.__name__, exc)
+
+                if mail.attempts < max_attempts:
+                    mail.next_attempt = timezone.now() + timedelta(seconds=retry_delay * 2 ** (mail.attempts - 1))
+                else:
+                    mail.next_attempt = None
+                    logger.error('Giving up on mail %d after %d attempts: %s', mail.id, mail.attempts, mail.last_error)
+
+                mail.save(update_fields=('attempts', 'next_attempt', 'last_error'))
+                failed += 1
+            else:
+                mail.delete()
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
\ No newline at end of file
@@ -22,11 +22,22 @@
 # SOFTWARE.
 ##
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.paginator import PageNotAnInteger, Paginator, EmptyPage
+from django.db import connections
+from django.db.models import Q
 from django.utils.safestring import mark_safe
 from urllib.parse import urlencode
 
-__all__ = ['Pagination']
+import base64
+import binascii
+import hashlib
+import json
+import math
+
+__all__ = ['KeysetPagination', 'Pagination']
 
 
 class Pagination(object):
@@ -47,6 +58,10 @@ class Pagination(object):
     def __len__(self):
         return self.paginator.num_pages
 
+    @property
+    def count(self):
+        return self.paginator.count
+
     def __str__(self):
         return mark_safe(self.render())
 
@@ -115,4 +130,291 @@ class Pagination(object):
         s += '</ul>'
         s += '</nav>'
 
+        return s
+
+
+class KeysetPage(object):
+    """
+    A page of a KeysetPagination.
+    """
+
+    def __init__(self, object_list, number, objects_per_page, previous_cursor=None, next_cursor=None):
+        self.object_list = object_list
+        self.number = number
+        self.objects_per_page = objects_per_page
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.number - 1) * self.objects_per_page + 1
+
+    def end_index(self):
+        return (self.number - 1) * self.objects_per_page + len(self.object_list)
+
+
+class KeysetPagination(object):
+    """
+    Pagination by key values (also known as seek or cursor pagination).
+
+    Instead of counting and skipping rows with OFFSET, every page is fetched
+    by filtering on the ordering keys of the last (or first) row of the
+    neighbouring page, so that deep pages cost the same as the first one
+    given an index on the keys.
+
+    The position is passed around as an opaque cursor token. The total count
+    is only used for display and is estimated or cached (see get_count).
+    """
+
+    def __init__(self, object_list, objects_per_page, url, cursor=None, keys=('id',), count_ttl=None):
+        """
+        :param object_list: QuerySet
+        :param objects_per_page: Number of objects per page (int)
+        :param url: Base URL
+        :param cursor: Cursor token (str, optional)
+        :param keys: Ordering fields, which must be unique in combination (prefix "-" for descending order)
+        :param count_ttl: Seconds to cache the total count (int, optional)
+        """
+        self.object_list = object_list
+        self.objects_per_page = objects_per_page
+        self.url = url
+        self.query = {}
+        self.keys = tuple(keys)
+        self.count_ttl = count_ttl if count_ttl is not None else settings.PAGINATION_COUNT_CACHE_TTL
+
+        try:
+            self.page = self.get_page(self.decode_cursor(cursor) if cursor else {})
+        except (ValueError, ValidationError):
+            self.page = self.get_page({})
+
+    def __len__(self):
+        return max(self.num_pages, self.page.number + (1 if self.page.has_next() else 0))
+
+    def __str__(self):
+        return mark_safe(self.render())
+
+    @property
+    def count(self):
+        if not hasattr(self, '_count'):
+            self._count = self.get_count()
+        return self._count
+
+    @property
+    def num_pages(self):
+        if self.count == 0:
+            return 1
+        return int(math.ceil(self.count / float(self.objects_per_page)))
+
+    def get_count(self):
+        """
+        Get the (approximate) total number of objects.
+
+        Unfiltered querysets on PostgreSQL use the planner's row estimate.
+        Everything else is counted once and cached for count_ttl seconds.
+
+        :return: int
+        """
+        qs = self.object_list
+        connection = connections[qs.db]
+
+        if connection.vendor == 'postgresql' and not qs.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [qs.model._meta.db_table])
+                row = cursor.fetchone()
+
+            if row and row[0] >= 0:
+                return int(row[0])
+
+        if self.count_ttl <= 0:
+            return qs.count()
+
+        key = 'pagination_count:' + hashlib.md5(str(qs.query).encode('utf-8')).hexdigest()
+        count = cache.get(key)
+
+        if count is None:
+            count = qs.count()
+            cache.set(key, count, self.count_ttl)
+
+        return count
+
+    @staticmethod
+    def encode_cursor(position):
+        """
+        Encode a position as cursor token.
+
+        :param position: dict
+        :return: str
+        """
+        data = json.dumps(position, default=str, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token):
+        """
+        Decode a cursor token.
+
+        :param token: str
+        :return: dict
+        :raises ValueError: Invalid token
+        """
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            position = json.loads(data.decode('utf-8'))
+        except (binascii.Error, TypeError, UnicodeDecodeError):
+            raise ValueError('Invalid cursor')
+
+        if not isinstance(position, dict) or not isinstance(position.get('n', 1), int):
+            raise ValueError('Invalid cursor')
+
+        for k in ('a', 'b'):
+            if k in position and not isinstance(position[k], list):
+                raise ValueError('Invalid cursor')
+
+        return position
+
+    def get_key_values(self, obj):
+        return [getattr(obj, k.lstrip('-')) for k in self.keys]
+
+    def get_seek_filter(self, values, reverse=False):
+        """
+        Build a filter for rows following (or preceding) the given key values.
+
+        :param values: Key values (list)
+        :param reverse: Seek backwards (bool)
+        :return: Q
+        """
+        if len(values) != len(self.keys):
+            raise ValueError('Invalid cursor')
+
+        q = Q()
+        equal = {}
+
+        for key, value in zip(self.keys, values):
+            name = key.lstrip('-')
+            descending = key.startswith('-') != reverse
+            q |= Q(**dict(equal, **{name + ('__lt' if descending else '__gt'): value}))
+            equal[name] = value
+
+        return q
+
+    def get_page(self, position):
+        """
+        Fetch the page for a decoded cursor position.
+
+        :param position: dict
+        :return: KeysetPage
+        """
+        number = max(position.get('n', 1), 1)
+        ordering = list(self.keys)
+        reverse_ordering = [k[1:] if k.startswith('-') else '-' + k for k in self.keys]
+        qs = self.object_list
+        limit = self.objects_per_page + 1
+
+        if 'a' in position:
+            objects = list(qs.filter(self.get_seek_filter(position['a'])).order_by(*ordering)[:limit])
+            has_more = len(objects) > self.objects_per_page
+            objects = objects[:self.objects_per_page]
+            has_next, has_previous = has_more, True
+        elif 'b' in position or position.get('last'):
+            size = self.objects_per_page
+
+            if position.get('last'):
+                # The last page holds the remainder, so that the pages before it are full
+                qs = qs.order_by(*reverse_ordering)
+                number = self.num_pages
+                size = min(max(self.count - (number - 1) * self.objects_per_page, 1), self.objects_per_page)
+            else:
+                qs = qs.filter(self.get_seek_filter(position['b'], reverse=True)).order_by(*reverse_ordering)
+
+            objects = list(qs[:size + 1])
+            has_more = len(objects) > size
+            objects = objects[:size][::-1]
+            has_next, has_previous = not position.get('last'), has_more
+        else:
+            objects = list(qs.order_by(*ordering)[:limit])
+            has_next, has_previous = len(objects) > self.objects_per_page, False
+            objects = objects[:self.objects_per_page]
+            number = 1
+
+        if not objects:
+            has_next = False
+
+        if has_previous and number <= 1:
+            number = 2
+        elif not has_previous:
+            number = 1
+
+        previous_cursor = next_cursor = None
+
+        if has_previous and objects:
+            if number > 2:
+                previous_cursor = self.encode_cursor({'b': self.get_key_values(objects[0]), 'n': number - 1})
+            else:
+                previous_cursor = ''
+
+        if has_next and objects:
+            next_cursor = self.encode_cursor({'a': self.get_key_values(objects[-1]), 'n': number + 1})
+
+        return KeysetPage(objects, number, self.objects_per_page, previous_cursor, next_cursor)
+
+    def get_url(self, **kwargs):
+        query = dict(self.query)
+        query.update(**kwargs)
+        url = self.url
+
+        if query:
+            url += '?' + urlencode(query)
+
+        return url
+
+    def render(self, param='p'):
+        """
+        Render HTML code for the KeysetPagination object.
+
+        Pages can only be reached relative to the current one, so the first,
+        the current and the last page are shown along with the arrows.
+
+        :param param: Cursor parameter (str)
+        :return: str
+        """
+        def cursor_url(cursor):
+            return self.get_url(**{param: cursor}) if cursor else self.get_url()
+
+        s = '<nav>'
+        s += '<ul class="pagination pagination-sm">'
+
+        if self.page.has_previous():
+            s += '<li><a href="{}"><i class="fa fa-angle-left"></i></a></li>'.format(
+                cursor_url(self.page.previous_cursor))
+
+        if self.page.number > 1:
+            s += '<li><a href="{}">1</a></li>'.format(self.get_url())
+
+        s += '<li class="active"><a href="#">{}</a></li>'.format(self.page.number)
+
+        last = len(self)
+        if last > self.page.number and self.page.has_next():
+            s += '<li><a href="{}">{}</a></li>'.format(
+                cursor_url(self.encode_cursor({'last': 1, 'n': last})), last)
+
+        if self.page.has_next():
+            s += '<li><a href="{}"><i class="fa fa-angle-right"></i></a></li>'.format(
+                cursor_url(self.page.next_cursor))
+
+        s += '</ul>'
+        s += '</nav>'
+
         return s
\ No newline at end of file
@@ -24,43 +24,96 @@
 
 from django.conf import settings
 from requests.exceptions import RequestException
+from threading import Lock
+from urllib.parse import urlsplit
+from .cache import ExpiringCache
+from .http import make_adapter, make_session, request_stats
 
-import requests
+import os
 
 
 ##
 # Simple reCAPTCHA support for reCAPTCHA v2.0
 ##
 
-# Verification URL
-_url_verify = 'https://www.google.com/recaptcha/api/siteverify'
+# Recently rejected responses (tokens are valid for two minutes)
+_cache = ExpiringCache(settings.RECAPTCHA_CACHE_SIZE, settings.RECAPTCHA_CACHE_TTL)
+
+_lock = Lock()
+_session = None
+_session_pid = None
 
 
 class RecaptchaError(ValueError):
     pass
 
 
+def get_session():
+    """
+    Get the keep-alive HTTP session used for verification.
+
+    A separate session is created in every (forked) process, so that
+    processes do not share connections.
+
+    :return: requests.Session
+    """
+    global _session, _session_pid
+
+    with _lock:
+        if _session_pid != os.getpid():
+            _session = make_session(make_adapter(settings.RECAPTCHA_TIMEOUT,
+                                                 retries=settings.RECAPTCHA_RETRIES,
+                                                 pool_size=settings.HTTP_POOL_SIZE))
+            _session_pid = os.getpid()
+
+        return _session
+
+
 def verify(response, remote_ip=None):
     """
     Verify user response.
 
     Raises RecaptchaError in case the response cannot be verified or is invalid.
+    Rejected responses are cached for RECAPTCHA_CACHE_TTL seconds. Accepted
+    responses are never cached, so that every response is accepted at most once.
 
     :param response: User response (str)
     :param remote_ip: Remote IP (optional)
     """
-    data = {'secret': settings.RECAPTCHA_SECRET_KEY,
-            'response': response}
+    errors = _cache.get(response) if response else None
+
+    if errors is None:
+        data = {'secret': settings.RECAPTCHA_SECRET_KEY,
+                'response': response}
 
-    if remote_ip:
-        data['remoteip'] = remote_ip
+        if remote_ip:
+            data['remoteip'] = remote_ip
 
-    try:
-        r = requests.post(_url_verify, data=data)
-    except RequestException as exc:
-        raise RecaptchaError(str(exc))
-    else:
-        reply = r.json()
+        try:
+            r = get_session().post(settings.RECAPTCHA_VERIFY_URL, data=data)
+            r.raise_for_status()
+            reply = r.json()
+        except (RequestException, ValueError) as exc:
+            raise RecaptchaError(str(exc))
+
+        if reply.get('success'):
+            return
+
+        errors = ', '.join(reply.get('error-codes', ())) or 'invalid-input-response'
+
+        if response:
+            _cache.set(response, errors)
+
+    raise RecaptchaError(errors)
+
+
+def stats():
+    """
+    Return verification statistics.
+
+    :return: dict
+    """
+    host = urlsplit(settings.RECAPTCHA_VERIFY_URL).hostname
 
-        if not reply['success']:
-            raise RecaptchaError(', '.join(reply['error-codes']))
\ No newline at end of file
+    return {'cache': _cache.stats(),
+            'requests': request_stats.get_stats().get(host)}
\ No newline at end of file
@@ -0,0 +1,98 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from collections import OrderedDict
+from .background import PeriodicFlusher
+
+import logging
+
+__all__ = ['TimingStats']
+
+logger = logging.getLogger(__name__)
+
+
+class TimingStats(PeriodicFlusher):
+    """
+    Timing statistics (count, errors, average and maximum duration) per name.
+
+    Statistics are collected per process and logged every `interval`
+    seconds and when the process exits. An interval of 0 disables them.
+    """
+
+    def __init__(self, interval, label):
+        """
+        Initialize statistics.
+
+        :param interval: Log interval in seconds (int, float)
+        :param label: Label of the measured operation, used for logging (str)
+        """
+        super(TimingStats, self).__init__(interval)
+        self.label = label
+        self._stats = {}
+
+    def add(self, name, duration, error=False):
+        """
+        Record a measurement.
+
+        :param name: Name, e.g. of the template or host (str)
+        :param duration: Duration in seconds (float)
+        :param error: Whether the operation failed (bool)
+        """
+        if self.interval <= 0:
+            return
+
+        with self._lock:
+            self.start()
+            count, errors, total, maximum = self._stats.get(name, (0, 0, 0.0, 0.0))
+            self._stats[name] = (count + 1, errors + bool(error), total + duration, max(maximum, duration))
+
+    def flush(self):
+        """
+        Log the statistics.
+
+        :return: Number of names (int)
+        """
+        stats = self.get_stats()
+
+        for name, s in stats.items():
+            logger.info('%s %s: %d calls, %d errors, %.2f ms avg, %.2f ms max',
+                        self.label, name, s['count'], s['errors'], s['avg'] * 1e3, s['max'] * 1e3)
+
+        return len(stats)
+
+    def get_stats(self):
+        """
+        Get the statistics, ordered by total duration (highest first).
+
+        :return: dict
+        """
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda x: x[1][2], reverse=True)
+
+        return OrderedDict((name, {'count': count, 'errors': errors, 'total': total,
+                                   'avg': total / count, 'max': maximum})
+                           for name, (count, errors, total, maximum) in items)
+
+    def reset(self):
+        self._stats = {}
\ No newline at end of file
@@ -0,0 +1,118 @@
+##
+# YDNS Core
+#
+# Copyright (c) 2015 Christian Jurk <commx@commx.ws>
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+##
+
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates, Template
+from .stats import TimingStats
+
+import django
+import logging
+import os
+import time
+
+__all__ = ['InstrumentedDjangoTemplates', 'render_stats', 'warm_up']
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedTemplate(Template):
+    """
+    Template which records its render time.
+    """
+
+    def render(self, context=None, request=None):
+        name = self.template.name or '<string>'
+        start = time.perf_counter()
+
+        try:
+            result = super(InstrumentedTemplate, self).render(context, request)
+        except Exception:
+            render_stats.add(name, time.perf_counter() - start, error=True)
+            raise
+
+        render_stats.add(name, time.perf_counter() - start)
+        return result
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """
+    Django template backend collecting render time statistics (see render_stats).
+    """
+
+    def from_string(self, template_code):
+        return self.instrument(super(InstrumentedDjangoTemplates, self).from_string(template_code))
+
+    def get_template(self, template_name, *args, **kwargs):
+        return self.instrument(super(InstrumentedDjangoTemplates, self).get_template(template_name, *args, **kwargs))
+
+    def instrument(self, template):
+        """
+        Wrap a template of the base backend.
+
+        Django 1.9 added the backend as a second argument of the template.
+
+        :param template: django.template.backends.django.Template
+        :return: InstrumentedTemplate
+        """
+        if django.VERSION < (1, 9):
+            return InstrumentedTemplate(template.template)
+        return InstrumentedTemplate(template.template, self)
+
+
+def warm_up(extensions=('.html', '.mail')):
+    """
+    Load all templates of the template directories.
+
+    With the cached template loader, this compiles every template once at
+    worker boot instead of on the first request using it.
+
+    :param extensions: File extensions of templates (tuple)
+    :return: Number of loaded templates (int)
+    """
+    count = 0
+
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+
+        for directory in backend.engine.dirs:
+            for root, dirs, files in os.walk(directory):
+                for filename in files:
+                    if not filename.endswith(extensions):
+                        continue
+
+                    name = os.path.relpath(os.path.join(root, filename), directory).replace(os.sep, '/')
+
+                    try:
+                        backend.engine.get_template(name)
+                    except (TemplateDoesNotExist, TemplateSyntaxError) as exc:
+                        logger.warning('Cannot load template %s: %s', name, exc)
+                    else:
+                        count += 1
+
+    return count
+
+
+render_stats = TimingStats(settings.TEMPLATE_STATS_INTERVAL, 'Template')
\ No newline at end of file
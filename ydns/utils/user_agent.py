@@ -22,51 +22,143 @@
 # SOFTWARE.
 ##
 
+from django.conf import settings
+from functools import lru_cache
+
 import re
 
-_re_chrome = re.compile(r'Chrome/(\S+)')
-_re_safari = re.compile(r'Safari/(\S+)')
-_re_osx_ver = re.compile(r'OS X ([A-Za-z0-9_]+)')
+__all__ = ['parse']
 
+# Clients in order of precedence: (name, type, token pattern). A version may follow
+# the token, separated by "/" or a space.
+_clients = (
+    # Dynamic DNS updaters
+    ('ddclient', 'updater', r'ddclient'),
+    ('inadyn', 'updater', r'inadyn(?:-mt)?'),
+    ('ez-ipupdate', 'updater', r'ez-ipupdate'),
 
-def parse(s):
+    # Routers and appliances
+    ('FRITZ!Box', 'router', r'fritz!box'),
+    ('MikroTik', 'router', r'mikrotik'),
+    ('pfSense', 'router', r'pfsense'),
+    ('OPNsense', 'router', r'opnsense'),
+    ('Synology', 'router', r'synology'),
+    ('DD-WRT', 'router', r'dd-wrt'),
+    ('OpenWrt', 'router', r'openwrt|uclient-fetch'),
+
+    # Command line tools and HTTP libraries
+    ('curl', 'tool', r'curl'),
+    ('Wget', 'tool', r'wget'),
+    ('PowerShell', 'tool', r'(?:windows)?powershell'),
+    ('HTTPie', 'tool', r'httpie'),
+    ('Python Requests', 'tool', r'python-requests'),
+    ('Python', 'tool', r'python-urllib'),
+    ('Go', 'tool', r'go-http-client'),
+    ('OkHttp', 'tool', r'okhttp'),
+
+    # Browsers (most specific first, as e.g. Chrome also claims to be Safari)
+    ('Microsoft Edge', 'browser', r'edg[ae]?'),
+    ('Opera', 'browser', r'opr|opera'),
+    ('Firefox', 'browser', r'firefox'),
+    ('Google Chrome', 'browser', r'chrome|crios'),
+    ('Safari', 'browser', r'safari'),
+    ('Internet Explorer', 'browser', r'msie|trident'),
+)
+
+# Operating systems in order of precedence: (name, icon, token pattern)
+_systems = (
+    ('Android', 'android', r'android'),
+    ('iOS', 'apple', r'(?:iphone|cpu) os|ipad'),
+    ('Windows', 'windows', r'windows(?: nt)?'),
+    ('OS X', 'apple', r'os x'),
+    ('Chrome OS', 'chrome', r'cros'),
+    ('Linux', 'linux', r'linux'),
+    ('X11', None, r'x11'),
+)
+
+# Icons of clients without operating system
+_type_icons = {'updater': 'refresh', 'router': 'wifi', 'tool': 'terminal'}
+
+
+def _compile(rules):
     """
-    Parse user agent string.
+    Compile rules into a single pattern, so that a user agent is scanned once.
+
+    :param rules: Rules (tuple)
+    :return: Compiled pattern
+    """
+    return re.compile('|'.join(r'\b(?P<r{0}>{1})(?![\w-])(?:[/ ](?P<v{0}>\d[\w.]*))?'.format(i, rule[2])
+                               for i, rule in enumerate(rules)),
+                      re.IGNORECASE)
 
+
+_re_clients = _compile(_clients)
+_re_systems = _compile(_systems)
+
+
+def _match(pattern, s):
+    """
+    Find the rule of highest precedence matching a string.
+
+    :param pattern: Compiled rules
     :param s: str
-    :return: dict
+    :return: Tuple of rule index and version, or (None, None)
     """
+    best = (None, None)
+
+    for match in pattern.finditer(s):
+        i = int(match.lastgroup[1:])
+        version = match.group('v{}'.format(i))
+
+        if best[0] is None or i < best[0]:
+            best = (i, version.replace('_', '.') if version else None)
+
+    return best
+
+
+@lru_cache(maxsize=settings.USER_AGENT_CACHE_SIZE)
+def _parse(s):
     ua = {'os': None,
           'os_version': None,
           'browser': None,
-          'browser_version': None}
-
-    if 'OS X' in s:
-        ua['os'] = 'OS X'
-
-        match = _re_osx_ver.findall(s)
-        if match:
-            ver_str = match[0].replace('_', '.')
-            ua['os_version'] = ver_str
-    elif 'X11' in s:
-        if 'Linux' in s:
-            ua['os'] = 'Linux'
-        else:
-            ua['os'] = 'X11'
-    elif 'Windows' in s:
-        ua['os'] = 'Windows'
-
-    if 'Chrome/' in s:
-        match = _re_chrome.findall(s)
-        if match:
-            ua['browser'] = 'Google Chrome'
-            ua['browser_version'] = match[0]
-    elif 'Safari/' in s:
-        match = _re_safari.findall(s)
-        if match:
-            ua['browser'] = 'Safari'
-            ua['browser_version'] = match[0]
-    elif 'MSIE' in s:
-        ua['browser'] = 'Internet Explorer'
-
-    return ua
\ No newline at end of file
+          'browser_version': None,
+          'type': None,
+          'icon': None,
+          's': None}
+
+    i, version = _match(_re_systems, s)
+
+    if i is not None:
+        ua['os'], ua['icon'], _ = _systems[i]
+        ua['os_version'] = version
+
+    i, version = _match(_re_clients, s)
+
+    if i is not None:
+        ua['browser'], ua['type'], _ = _clients[i]
+        ua['browser_version'] = version
+        ua['s'] = ua['browser']
+
+        if ua['os']:
+            ua['s'] += ' ({})'.format(ua['os'])
+
+        if not ua['icon']:
+            ua['icon'] = _type_icons.get(ua['type'])
+
+    return ua
+
+
+def parse(s):
+    """
+    Parse user agent string.
+
+    Results are cached (see USER_AGENT_CACHE_SIZE), as clients such as
+    updaters send the same user agent over and over again.
+
+    :param s: str
+    :return: dict
+    """
+    return dict(_parse(s))
+
+
+cache_info = _parse.cache_info
\ No newline at end of file
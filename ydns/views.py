@@ -26,7 +26,7 @@ from django.contrib import messages
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseRedirect
 from django.views import generic
-from domains.models import Domain
+from domains.utils import get_user_domains
 
 
 class _BaseMixin(object):
@@ -59,6 +59,8 @@ class _BaseMixin(object):
         :param kwargs: Keyword arguments
         :return: HttpResponse
         """
+        request.view = self
+
         if not request.user.is_authenticated():
             if self.require_login or self.require_admin:
                 return self.redirect_insufficient_privileges(request)
@@ -173,19 +175,10 @@ class DashboardView(TemplateView):
         Get domains a specific user has access to.
 
         :param user: User instance
-        :return:
+        :return: list
         """
-        domains = set()
-
-        for domain in Domain.objects.all():
-            if domain.owner == user:
-                domains.add(domain)
-            else:
-                # TODO: Look if the user has any records in this domain
-                # TODO: Look if the user has any pending host requests
-                pass
-
-        return domains
+        # TODO: Look if the user has any pending host requests
+        return get_user_domains(user)
 
 
 class DonateView(_AnonymousView):
@@ -12,3 +12,8 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ydns.settings")
 
 from django.core.wsgi import get_wsgi_application
 application = get_wsgi_application()
+
+
+# Compile all templates before the first request (only effective with the cached template loader)
+from ydns.utils.templates import warm_up
+warm_up()
\ No newline at end of file